@@ -1,85 +1,168 @@
+import gzip
 import os
-from flask import Flask, render_template, jsonify
+import threading
+from flask import Blueprint, Flask, Response, current_app, render_template, request, stream_template
 from dotenv import load_dotenv
-from nobel_data import get_nobel_laureates, get_all_laureates
+import assets
+import metrics
+import profiling
+import nobel_api
+import tiles
+from freeze import freeze_command
+from nobel_api import CATEGORIES
+from nobel_data import get_all_laureates, get_derived, get_load_info, find_laureate
 
 load_dotenv()
 
-app = Flask(__name__)
-app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+bp = Blueprint('nobel', __name__)
 
-# Nobel Prize categories
-CATEGORIES = {
-    'physics': 'Physics',
-    'chemistry': 'Chemistry',
-    'medicine': 'Physiology or Medicine',
-    'literature': 'Literature',
-    'peace': 'Peace',
-    'economics': 'Economic Sciences'
-}
+# Streamed pages are flushed in pieces of at least this many characters
+STREAM_CHUNK_SIZE = 8192
 
-@app.route('/')
+def _cached_page(html, compress):
+    """Rendered page -> {'html': bytes, 'gzip': bytes or None}, kept for as long as the data stays loaded"""
+    body = html.encode('utf-8')
+    return {'html': body, 'gzip': gzip.compress(body, mtime=0) if compress else None}
+
+def _page_response(page):
+    """A cached page as a response, gzipped if the client accepts it"""
+    if page['gzip'] is not None and 'gzip' in request.accept_encodings:
+        response = Response(page['gzip'], mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(page['html'], mimetype='text/html')
+    response.vary.add('Accept-Encoding')
+    return response
+
+def _stream_and_cache(chunks, pages, name, compress):
+    """Pass a streamed template through in STREAM_CHUNK_SIZE pieces, then cache the whole page"""
+    rendered = []
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_CHUNK_SIZE:
+            rendered.append(''.join(buffer))
+            yield rendered[-1]
+            buffer, size = [], 0
+    rendered.append(''.join(buffer))
+    yield rendered[-1]
+    pages[name] = _cached_page(''.join(rendered), compress)
+
+@bp.route('/')
 def index():
     """Main page with category selector"""
-    return render_template('index.html', categories=CATEGORIES)
+    tile_url = tiles.tile_url_template(current_app)
+    if not current_app.config['INLINE_BOOTSTRAP']:
+        return render_template('index.html', categories=CATEGORIES, tile_url=tile_url)
 
-@app.route('/table')
-def table_view():
-    """Table view of all Nobel Prize winners"""
-    all_data = get_all_laureates()
+    # Default view's markers inlined so the first paint needs no API request;
+    # rendered once per data load
+    compress = current_app.config['GZIP_PAGES']
+    return _page_response(get_derived('page:index', lambda data: _cached_page(render_template(
+        'index.html', categories=CATEGORIES, tile_url=tile_url, bootstrap=nobel_api.bootstrap('all'),
+        version=get_load_info()['version']), compress)))
 
-    # Flatten data for table view
+def table_laureates():
+    """Every laureate flattened for the table view, newest first"""
     all_laureates = []
-    for category, laureates in all_data.items():
+    for category, laureates in get_all_laureates().items():
         for laureate in laureates:
             laureate_copy = laureate.copy()
             laureate_copy['category'] = CATEGORIES.get(category, category)
             laureate_copy['category_key'] = category
             # Get co-laureate names
-            if laureate['shared_with']:
-                co_names = []
-                for co_id in laureate['shared_with']:
-                    co_laureate = next((l for l in laureates if l['laureate_id'] == co_id), None)
-                    if co_laureate:
-                        co_names.append(co_laureate['name'])
-                laureate_copy['co_laureate_names'] = ', '.join(co_names)
-            else:
-                laureate_copy['co_laureate_names'] = '-'
+            co_laureates = [find_laureate(co_id) for co_id in laureate['shared_with']]
+            co_names = [found[1]['name'] for found in co_laureates if found]
+            laureate_copy['co_laureate_names'] = ', '.join(co_names) if laureate['shared_with'] else '-'
             all_laureates.append(laureate_copy)
 
     # Sort by year descending
     all_laureates.sort(key=lambda x: x['prize_year'], reverse=True)
+    return all_laureates
+
+@bp.route('/table')
+def table_view():
+    """Table view of all Nobel Prize winners"""
+    pages = get_derived('pages', lambda data: {})
+    if 'table' in pages:
+        return _page_response(pages['table'])
 
-    return render_template('table.html', laureates=all_laureates, categories=CATEGORIES)
+    # First request for this data: send the header and first rows while the rest renders
+    chunks = stream_template('table.html', laureates=table_laureates(), categories=CATEGORIES)
+    compress = current_app.config['GZIP_PAGES']
+    return Response(_stream_and_cache(chunks, pages, 'table', compress), mimetype='text/html')
 
-@app.route('/api/laureates/<category>')
+def _respond(handler, *args):
+    """Call a nobel_api handler with the media type picked from the Accept header -> Flask response"""
+    media_type = nobel_api.negotiate(request.headers.get('Accept'))
+    body, status = handler(*args, media_type=media_type)
+    response = Response(body, status=status, mimetype=media_type)
+    response.vary.add('Accept')
+    return response
+
+@bp.route('/ready')
+def readiness():
+    """200 once this process has the data and indexes warm, 503 before (for load balancer probes)"""
+    return _respond(nobel_api.ready)
+
+@bp.route('/api/laureates/<category>')
 def get_laureates(category):
     """Get Nobel laureates for a specific category or all categories"""
-    if category == 'all':
-        # Return all laureates with their category information
-        all_data = get_all_laureates()
-        all_laureates = []
-        for cat_key, laureates in all_data.items():
-            for laureate in laureates:
-                laureate_copy = laureate.copy()
-                laureate_copy['category'] = cat_key
-                all_laureates.append(laureate_copy)
-
-        return jsonify({
-            'category': 'All Categories',
-            'laureates': all_laureates
-        })
-
-    if category not in CATEGORIES:
-        return jsonify({'error': 'Category not found'}), 404
-
-    laureates = get_nobel_laureates(category)
-
-    return jsonify({
-        'category': CATEGORIES[category],
-        'laureates': laureates
-    })
+    return _respond(nobel_api.laureates, category, request.args)
+
+@bp.route('/api/laureate/<laureate_id>')
+def get_laureate(laureate_id):
+    """Get every field of one laureate (achievement etc. are left out of ?fields=map)"""
+    return _respond(nobel_api.laureate, laureate_id)
+
+@bp.route('/api/stats')
+def get_all_stats():
+    """Get all precomputed statistics (counts by work city, birth country, decade, ...)"""
+    return _respond(nobel_api.stats)
+
+@bp.route('/api/stats/<name>')
+def get_single_stat(name):
+    """Get one precomputed statistic, optionally limited to the top N rows"""
+    return _respond(nobel_api.stat, name, request.args)
+
+@bp.route('/api/flows')
+def get_migration_flows():
+    """Get birth -> work flows between countries or cities, with counts and median distance"""
+    return _respond(nobel_api.flows, request.args)
+
+@bp.route('/api/nearest')
+def get_nearest_laureates():
+    """Get the laureates who worked (or were born) closest to a point"""
+    return _respond(nobel_api.nearest, request.args)
+
+def create_app(warm=True):
+    """
+    Application factory. With warm=True the data is loaded before the first request,
+    unless NOBEL_WARM=background: then it loads in a thread while requests are
+    already accepted, and /ready answers 503 until it's done
+    """
+    if warm is True and os.environ.get('NOBEL_WARM', 'eager') == 'background':
+        warm = 'background'
+    app = Flask(__name__)
+    app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+    # Inline the default view's data into index.html (NOBEL_INLINE_BOOTSTRAP=1)
+    app.config['INLINE_BOOTSTRAP'] = os.environ.get('NOBEL_INLINE_BOOTSTRAP', '0') == '1'
+    # Keep a gzipped copy of cached pages (NOBEL_GZIP_PAGES=0 to turn off)
+    app.config['GZIP_PAGES'] = os.environ.get('NOBEL_GZIP_PAGES', '1') == '1'
+    app.register_blueprint(bp)
+    app.cli.add_command(freeze_command)
+    assets.init_app(app)
+    tiles.init_app(app)
+    profiling.init_app(app)
+    metrics.init_app(app)
+    if warm == 'background':
+        threading.Thread(target=nobel_api.warm_up, name='warm-up', daemon=True).start()
+    elif warm:
+        nobel_api.warm_up()
+    return app
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=True, host='0.0.0.0', port=port)
+    create_app().run(debug=True, host='0.0.0.0', port=port)
@@ -0,0 +1,81 @@
+"""
+ASGI entry point for the /api/* endpoints
+Serves the same in-memory dataset and pre-encoded responses as the Flask app
+(both go through nobel_api), without a WSGI thread per connection. The HTML
+pages are only served by the Flask app.
+
+    uvicorn asgi:app --port 8001
+"""
+from urllib.parse import parse_qsl
+
+import nobel_api
+
+# path -> handler(query args, media type)
+EXACT_ROUTES = {
+    '/api/stats': nobel_api.stats,
+    '/api/flows': nobel_api.flows,
+    '/api/nearest': nobel_api.nearest,
+    '/ready': nobel_api.ready,
+}
+# path prefix -> handler(path parameter, query args, media type)
+PREFIX_ROUTES = {
+    '/api/laureates/': nobel_api.laureates,
+    '/api/laureate/': nobel_api.laureate,
+    '/api/stats/': nobel_api.stat,
+}
+
+
+def route(path, args, media_type):
+    """(body, status) for a request path"""
+    handler = EXACT_ROUTES.get(path)
+    if handler:
+        return handler(args, media_type)
+    for prefix, handler in PREFIX_ROUTES.items():
+        if path.startswith(prefix):
+            parameter = path[len(prefix):]
+            if parameter and '/' not in parameter:
+                return handler(parameter, args, media_type)
+    return nobel_api.error('Not found', 404, media_type)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            nobel_api.warm_up()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    accept = next((value for name, value in scope['headers'] if name == b'accept'), b'')
+    media_type = nobel_api.negotiate(accept.decode('latin-1'))
+    if scope['method'] not in ('GET', 'HEAD'):
+        body, status = nobel_api.error('Method not allowed', 405, media_type)
+    else:
+        args = {}
+        for name, value in parse_qsl(scope['query_string'].decode('latin-1')):
+            args.setdefault(name, value)  # first value wins, like request.args.get()
+        body, status = route(scope['path'], args, media_type)
+
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', media_type.encode()),
+            (b'content-length', str(len(body)).encode()),
+            (b'vary', b'Accept'),
+        ],
+    })
+    await send({
+        'type': 'http.response.body',
+        'body': body if scope['method'] == 'GET' else b'',
+    })
@@ -0,0 +1,143 @@
+"""
+Load test: WSGI (gunicorn + Flask) vs ASGI (uvicorn + asgi.py) on the /api/* endpoints
+Starts both servers with the same worker count, then drives each with a local
+asyncio load generator (keep-alive HTTP/1.1 connections, each sending requests
+back to back) at several concurrency levels. Reports requests/sec and latency
+percentiles.
+
+    python benchmarks/asgi_vs_wsgi.py [--concurrency 100,250,500,1000] [--duration 10] [--workers 2] [--path /api/stats]
+                                      [--scale N]
+
+--scale N serves a synthetic dataset N times the size of the real one
+(nobel_data_pipeline/synthetic_data.py, seed 0) instead of nobel_data_complete.json.
+
+Needs gunicorn and uvicorn installed. The load generator shares the machine with
+the servers, so compare the two servers against each other, not against other machines.
+"""
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PATHS = ['/api/stats/work_countries', '/api/laureates/physics', '/api/flows?limit=20',
+         '/api/nearest?lat=48.85&lon=2.35&k=5']
+
+
+def start_server(kind, port, workers):
+    if kind == 'wsgi':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app',
+                   '--bind', f'127.0.0.1:{port}', '--access-logfile', '/dev/null']
+        env = dict(os.environ, WEB_CONCURRENCY=str(workers))
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port),
+                   '--workers', str(workers), '--no-access-log', '--log-level', 'warning']
+        env = dict(os.environ)
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Wait until it answers
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/stats', timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{kind} server did not start on port {port}")
+
+
+async def _connection(port, paths, stop_at, latencies, errors):
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    except OSError:
+        errors.append('connect')
+        return
+    i = 0
+    try:
+        while time.perf_counter() < stop_at:
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b'HTTP/1.1 200'):
+                errors.append(head.split(b'\r\n', 1)[0].decode())
+    except (OSError, asyncio.IncompleteReadError) as e:
+        errors.append(type(e).__name__)
+    finally:
+        writer.close()
+
+
+async def load(port, concurrency, duration, paths):
+    """Run `concurrency` connections for `duration` seconds. Returns (latencies, errors, elapsed)"""
+    latencies, errors = [], []
+    start = time.perf_counter()
+    stop_at = start + duration
+    await asyncio.gather(*[_connection(port, paths, stop_at, latencies, errors) for _ in range(concurrency)])
+    return latencies, errors, time.perf_counter() - start
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else 0
+
+
+def main():
+    def option(name, default):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    levels = [int(c) for c in option('--concurrency', '100,250,500,1000').split(',')]
+    duration = float(option('--duration', 10))
+    workers = int(option('--workers', 2))
+    paths = [option('--path', None)] if '--path' in sys.argv else PATHS
+    scale = int(option('--scale', 1))
+    if scale > 1:
+        sys.path.insert(0, os.path.join(ROOT, 'nobel_data_pipeline'))
+        from synthetic_data import generate, write_json
+        data_file = os.path.join(tempfile.mkdtemp(), f'nobel_data_{scale}x.json')
+        write_json(generate(1026 * scale), data_file)
+        os.environ['NOBEL_DATA_FILE'] = data_file
+        print(f"Serving a synthetic dataset {scale}x the real one ({data_file})")
+
+    # Each connection needs a file descriptor on both ends
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, max(levels) * 2 + 256)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    results = []
+    for kind, port in (('wsgi', 8801), ('asgi', 8802)):
+        process = start_server(kind, port, workers)
+        try:
+            asyncio.run(load(port, 10, 1, paths))  # warm up
+            for concurrency in levels:
+                latencies, errors, elapsed = asyncio.run(load(port, concurrency, duration, paths))
+                results.append((kind, concurrency, len(latencies) / elapsed,
+                                percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000, len(errors)))
+                print(f"  {kind} c={concurrency}: {results[-1][2]:.0f} req/s")
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(f"\n{workers} worker(s) each, {duration:.0f}s per level, paths: {', '.join(paths)}\n")
+    print(f"{'server':<8}{'conns':>7}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for kind, concurrency, rps, p50, p99, errors in results:
+        print(f"{kind:<8}{concurrency:>7}{rps:>10.0f}{p50:>10.1f}{p99:>10.1f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
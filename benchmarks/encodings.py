@@ -0,0 +1,66 @@
+"""
+Response encodings: JSON vs MessagePack vs CBOR
+For the largest API payloads, measures encode time (what a request would cost
+without the pre-encoded cache), payload size raw and gzipped, and decode time
+(a stand-in for client parse time; browsers' JSON.parse is native, so JSON fares
+better there than in this Python comparison).
+
+    python benchmarks/encodings.py [--repeat 20]
+"""
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import nobel_api
+from nobel_data import get_derived
+
+DECODERS = {nobel_api.JSON: json.loads}
+if nobel_api.msgpack is not None:
+    DECODERS[nobel_api.MSGPACK] = nobel_api.msgpack.unpackb
+if nobel_api.cbor2 is not None:
+    DECODERS[nobel_api.CBOR] = nobel_api.cbor2.loads
+
+PAYLOADS = [
+    ('/api/laureates/all', 'laureates:all'),
+    ('/api/stats', 'stats'),
+]
+
+
+def best_time(function, argument, repeat):
+    """Fastest of `repeat` runs, in ms"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    repeat = int(sys.argv[sys.argv.index('--repeat') + 1]) if '--repeat' in sys.argv else 20
+
+    nobel_api.warm_up()
+    # Payloads as cached by warm_up(), before encoding
+    payloads = [(name, get_derived(f'payload:{key}', None)) for name, key in PAYLOADS]
+    columnar = nobel_api.to_columnar(nobel_api._records('all'), nobel_api.MAP_FIELDS)
+    payloads.append(('/api/laureates/all?fields=map&format=columnar', columnar))
+
+    missing = [t for t in (nobel_api.MSGPACK, nobel_api.CBOR) if t not in nobel_api.ENCODERS]
+    if missing:
+        print(f"⚠ Not installed, skipped: {', '.join(missing)}")
+
+    print(f"\n{'payload / encoding':<52}{'encode ms':>10}{'bytes':>10}{'gzip':>9}{'decode ms':>11}")
+    for name, payload in payloads:
+        print(name)
+        for media_type, encoder in nobel_api.ENCODERS.items():
+            body = encoder(payload)
+            encode_ms = best_time(encoder, payload, repeat)
+            decode_ms = best_time(DECODERS[media_type], body, repeat)
+            print(f"  {media_type:<50}{encode_ms:>10.2f}{len(body):>10}{len(gzip.compress(body)):>9}{decode_ms:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
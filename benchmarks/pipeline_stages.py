@@ -0,0 +1,253 @@
+"""
+Pipeline stage micro-benchmarks
+Runs each data pipeline stage in-process on the recorded inputs in the repo and
+on synthetic datasets (nobel_data_pipeline/synthetic_data.py), and reports per
+stage: records/sec (best of --repeat runs), peak traced memory and the memory
+blocks the stage's result still holds when it returns (tracemalloc).
+
+- api_processing  step1 process_laureates_by_category() on API v2.1 records
+- csv_creation    step2 create_rows() + CSV writing
+- csv_read        csv_input.read_csv() (encoding detection and repair)
+- csv_json_merge  step4 merge_csv_locations() + add_distance_fields()
+- validation      validate_and_categorize() from the archived stage 6 script
+                  (plus reverse_geocode.check_consistency() if geodata/ is present)
+- diff            compare_laureates() from the archived compare_data.py
+
+    python benchmarks/pipeline_stages.py [--scales 10,100] [--repeat 3] [--seed 0] [--output results.json]
+
+Every run is appended to benchmarks/pipeline_history.jsonl and compared with the
+previous run there, so a stage that slowed down or grew shows up straight away.
+The recorded API input is rebuilt from nobel_data_complete.json, since the raw API
+responses aren't kept in the repo.
+"""
+import contextlib
+import copy
+import gc
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+PIPELINE_DIR = os.path.join(ROOT, 'nobel_data_pipeline')
+ARCHIVE_DIR = os.path.join(ROOT, 'old', 'old_pipeline_scripts')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, PIPELINE_DIR)
+from csv_input import read_csv
+from reverse_geocode import check_consistency
+from synthetic_data import api_laureates, generate, write_csv
+
+HISTORY_FILE = os.path.join(BENCHMARKS, 'pipeline_history.jsonl')
+
+# Laureates in the real dataset, the unit the scales multiply
+REAL_LAUREATES = 1026
+
+
+def load_script(name, path):
+    """Import a pipeline script by path (step scripts aren't importable by name)"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+fetch = load_script('fetch_from_api', os.path.join(PIPELINE_DIR, 'step1', '01_fetch_from_api.py'))
+create_csv = load_script('create_data_csv', os.path.join(PIPELINE_DIR, 'step2', 'create_data_csv.py'))
+merge = load_script('create_nobel_complete', os.path.join(PIPELINE_DIR, 'step4', 'create_nobel_complete_from_csv.py'))
+validate = load_script('validate', os.path.join(ARCHIVE_DIR, 'pipeline', '06_validate.py'))
+compare = load_script('compare_data', os.path.join(ARCHIVE_DIR, 'compare_data.py'))
+
+
+def edited_copy(data):
+    """data with every 20th work location moved and every 100th laureate dropped, for the diff stage"""
+    edited = {}
+    for category, laureates in data.items():
+        edited[category] = []
+        for i, laureate in enumerate(laureates):
+            if i % 100 == 99:
+                continue
+            laureate = dict(laureate)
+            if i % 20 == 0:
+                laureate['work_location'] += ' (moved)'
+                laureate['work_lat'] += 0.5
+            edited[category].append(laureate)
+    return edited
+
+
+def recorded_inputs():
+    """Inputs from the files in the repo"""
+    with open(os.path.join(ROOT, 'nobel_data_complete.json'), 'r', encoding='utf-8') as f:
+        complete = json.load(f)
+    with open(os.path.join(PIPELINE_DIR, 'step2', 'input', '01_raw_from_api.json'), 'r', encoding='utf-8') as f:
+        api_data = json.load(f)
+    return {
+        'api_records': api_laureates(complete),
+        'api_data': api_data,
+        'csv_file': os.path.join(PIPELINE_DIR, 'step2', 'output', 'laureates_data_to_fill.csv'),
+        'complete': complete,
+        'edited': edited_copy(complete),
+    }
+
+
+def synthetic_inputs(count, seed, directory):
+    data = generate(count, seed)
+    csv_file = os.path.join(directory, f'synthetic_{count}.csv')
+    write_csv(data, csv_file)
+    return {
+        'api_records': api_laureates(data),
+        'api_data': data,
+        'csv_file': csv_file,
+        'complete': data,
+        'edited': edited_copy(data),
+    }
+
+
+def _csv_creation(inputs):
+    rows = create_csv.create_rows(inputs['api_data'], {})
+    create_csv.write_rows(io.StringIO(), rows)
+    return rows
+
+
+def _merge(inputs, api_data):
+    csv_data = {row['laureate_id']: row for row in read_csv(inputs['csv_file'])[0]}
+    merge.merge_csv_locations(api_data, csv_data)
+    merge.add_distance_fields(api_data)
+    return api_data
+
+
+def _validation(inputs):
+    result = validate.validate_and_categorize(inputs['complete'])
+    consistency = check_consistency(inputs['complete'])
+    return result, consistency
+
+
+# name -> (run(inputs, prepared), prepare(inputs) called untimed before each run)
+STAGES = {
+    'api_processing': (lambda inputs, _: fetch.process_laureates_by_category(inputs['api_records']), None),
+    'csv_creation': (lambda inputs, _: _csv_creation(inputs), None),
+    'csv_read': (lambda inputs, _: read_csv(inputs['csv_file']), None),
+    'csv_json_merge': (_merge, lambda inputs: copy.deepcopy(inputs['api_data'])),
+    'validation': (lambda inputs, _: _validation(inputs), None),
+    'diff': (lambda inputs, _: compare.compare_laureates(inputs['complete'], inputs['edited']), None),
+}
+
+
+def measure(run, prepare, inputs, records, repeat):
+    """{records, records_per_sec, seconds, peak_kb, retained_blocks} for one stage"""
+    best = float('inf')
+    for _ in range(repeat):
+        prepared = prepare(inputs) if prepare else None
+        gc.collect()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(inputs, prepared)
+        best = min(best, time.perf_counter() - start)
+
+    prepared = prepare(inputs) if prepare else None
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run(inputs, prepared)
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del result
+
+    return {
+        'records': records,
+        'records_per_sec': round(records / best),
+        'seconds': round(best, 5),
+        'peak_kb': round(peak / 1024, 1),
+        'retained_blocks': retained,
+    }
+
+
+def previous_run(datasets):
+    """The last run in the history file that measured the same datasets"""
+    if not os.path.exists(HISTORY_FILE):
+        return None
+    previous = None
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            run = json.loads(line)
+            if set(run['results']) == set(datasets):
+                previous = run
+    return previous
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    def option(name, default):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    scales = [int(s) for s in option('--scales', '10,100').split(',')]
+    repeat = int(option('--repeat', 3))
+    seed = int(option('--seed', 0))
+    output = option('--output', None)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp:
+        datasets = [('recorded', recorded_inputs)]
+        datasets += [(f'synthetic_{scale}x', lambda scale=scale: synthetic_inputs(REAL_LAUREATES * scale, seed, temp))
+                     for scale in scales]
+        for label, build in datasets:
+            inputs = build()
+            records = len(inputs['api_records'])
+            print(f"{label}: {records:,} laureates")
+            results[label] = {}
+            for name, (run, prepare) in STAGES.items():
+                results[label][name] = measure(run, prepare, inputs, records, repeat)
+                print(f"  {name}: {results[label][name]['seconds'] * 1000:.1f} ms")
+            del inputs
+
+    previous = previous_run(results)
+    print(f"\n{'dataset / stage':<30}{'records/s':>12}{'ms':>10}{'peak KB':>11}{'retained':>10}{'vs last':>9}")
+    for label, stages in results.items():
+        print(label)
+        for name, r in stages.items():
+            change = ''
+            old = previous and previous['results'].get(label, {}).get(name)
+            if old:
+                change = f"{r['seconds'] / old['seconds'] - 1:+.0%}"
+            print(f"  {name:<28}{r['records_per_sec']:>12,}{r['seconds'] * 1000:>10.1f}{r['peak_kb']:>11,.0f}"
+                  f"{r['retained_blocks']:>10,}{change:>9}")
+    if previous:
+        print(f"(vs last: time change against the run at {previous['revision']} on {previous['date']})")
+    if check_consistency({}) is None:
+        print("⚠ No nobel_data_pipeline/geodata/ - validation ran without the reverse-geocode check")
+
+    run = {
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'repeat': repeat,
+        'seed': seed,
+        'results': results,
+    }
+    with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run, sort_keys=True) + '\n')
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2, sort_keys=True)
+    print(f"✓ Appended to {os.path.relpath(HISTORY_FILE, ROOT)}" + (f" and wrote {output}" if output else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""
+HTTP benchmark of the Flask routes, at several dataset sizes
+Drives /, /table and /api/laureates/<category> (all and each category) and reports,
+per route: the cold first request, throughput, p50/p95/p99 latency and the peak
+memory allocated while serving one request. Runs on the real dataset and on
+synthetic ones 10x and 100x its size (nobel_data_pipeline/synthetic_data.py, fixed
+--seed, default 0), then compares with a stored baseline and exits non-zero if
+any route's p50 latency or memory grew by more than --threshold, or its cold
+request more than doubled (and by more than a small absolute noise floor).
+
+    python benchmarks/routes.py [--scales 1,10,100] [--duration 2] [--threshold 0.25]
+                                [--server inprocess|gunicorn] [--seed 0] [--cold-runs 5] [--save-baseline]
+
+The cold time is the median, over --cold-runs fresh processes, of a route's first
+request after the data is loaded but before warm_up(), i.e. with nothing derived
+from the data built or cached yet. Even as a median it varies by a third between
+runs on one machine, so it only catches algorithmic regressions, not small ones.
+
+--server inprocess (default) calls the WSGI app directly, measuring the app alone.
+--server gunicorn runs the bundled gunicorn profile with one worker and the asyncio
+load generator from asgi_vs_wsgi.py (--concurrency, default 10); memory is the
+worker's USS from /metrics. Baselines are machine-specific: re-record with
+--save-baseline (benchmarks/baseline-<server>.json) when switching machines.
+"""
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'nobel_data_pipeline'))
+from asgi_vs_wsgi import load, percentile, start_server
+from synthetic_data import generate, write_json
+
+REAL_DATA_FILE = os.path.join(ROOT, 'nobel_data_complete.json')
+# Laureates in the real dataset, the unit the scales multiply
+REAL_LAUREATES = 1026
+
+CATEGORIES = ['physics', 'chemistry', 'medicine', 'literature', 'peace', 'economics']
+ROUTES = ['/', '/table', '/api/laureates/all'] + [f'/api/laureates/{category}' for category in CATEGORIES]
+
+# Metrics compared with the baseline, and whether higher is worse
+COMPARED = {'cold_ms': True, 'p50_ms': True, 'memory_kb': True}
+
+# Cold times only count as a regression past this change, whatever --threshold is
+COLD_THRESHOLD = 1.0
+
+# Changes smaller than this are noise, whatever the percentage. Sub-millisecond
+# percentiles move by a tenth of a millisecond or two between runs on one machine.
+NOISE_FLOOR = {'cold_ms': 10.0, 'p50_ms': 0.25, 'memory_kb': 16.0}
+
+COLD_SCRIPT = """
+import json, sys, time
+from werkzeug.test import create_environ, run_wsgi_app
+import nobel_data
+from app import create_app
+app = create_app(warm=False)
+nobel_data.load_complete_data()
+start = time.perf_counter()
+body, status, _ = run_wsgi_app(app, create_environ(sys.argv[1]))
+b''.join(body)
+body.close()
+print(json.dumps({'status': status, 'ms': (time.perf_counter() - start) * 1000}))
+"""
+
+
+def dataset(scale, directory, seed):
+    """The real data file at 1x; otherwise a synthetic dataset `scale` times its size. Returns (path, laureates)"""
+    if scale == 1:
+        with open(REAL_DATA_FILE, 'r', encoding='utf-8') as f:
+            return REAL_DATA_FILE, sum(len(laureates) for laureates in json.load(f).values())
+    count = REAL_LAUREATES * scale
+    path = os.path.join(directory, f'nobel_data_{scale}x.json')
+    write_json(generate(count, seed), path)
+    return path, count
+
+
+def cold_ms(route, runs):
+    """Median first-request time for `route` over `runs` fresh processes (NOBEL_DATA_FILE from the environment)"""
+    samples = []
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, '-c', COLD_SCRIPT, route], cwd=ROOT, capture_output=True,
+                                 text=True, check=True)
+        sample = json.loads(process.stdout.strip().splitlines()[-1])
+        if not sample['status'].startswith('200'):
+            raise RuntimeError(f"{route}: {sample['status']}")
+        samples.append(sample['ms'])
+    return statistics.median(samples)
+
+
+def run_inprocess(duration, cold_runs):
+    """Time every route against the app called directly. Returns {route: result}"""
+    from werkzeug.test import create_environ, run_wsgi_app
+    import nobel_api
+    import nobel_data
+    from app import create_app
+
+    nobel_data.reload()
+    app = create_app(warm=False)
+    nobel_api.warm_up()
+
+    def request(path):
+        body, status, _ = run_wsgi_app(app, create_environ(path))
+        try:
+            size = sum(len(chunk) for chunk in body)
+        finally:
+            body.close()
+        if not status.startswith('200'):
+            raise RuntimeError(f"{path}: {status}")
+        return size
+
+    results = {}
+    for route in ROUTES:
+        size = request(route)
+
+        latencies = []
+        stop_at = time.perf_counter() + duration
+        while time.perf_counter() < stop_at or len(latencies) < 5:
+            start = time.perf_counter()
+            request(route)
+            latencies.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        request(route)
+        alloc = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results[route] = result(cold_ms(route, cold_runs), latencies, sum(latencies), size, alloc)
+        print(f"  {route}: {results[route]['p50_ms']:.2f} ms p50")
+    return results
+
+
+def run_gunicorn(duration, concurrency, cold_runs, port=8811):
+    """Time every route against gunicorn (one worker). Returns {route: result}"""
+    process = start_server('wsgi', port, 1)
+    try:
+        results = {}
+        for route in ROUTES:
+            size = len(urllib.request.urlopen(f'http://127.0.0.1:{port}{route}', timeout=60).read())
+
+            latencies, errors, elapsed = asyncio.run(load(port, concurrency, duration, [route]))
+            if errors:
+                print(f"  ⚠ {route}: {len(errors)} errors ({errors[0]})")
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=10) as response:
+                metrics = dict(line.rsplit(' ', 1) for line in response.read().decode().splitlines()
+                               if line and not line.startswith('#'))
+            uss = float(metrics.get('nobel_process_unique_memory_bytes', 0))
+
+            # The server warms up before it listens, so the cold time comes from fresh processes
+            results[route] = result(cold_ms(route, cold_runs), latencies, elapsed, size, uss)
+            print(f"  {route}: {results[route]['p50_ms']:.2f} ms p50")
+        return results
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def result(cold, latencies, elapsed, size, memory):
+    return {
+        'cold_ms': round(cold, 2),
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'bytes': size,
+        'memory_kb': round(memory / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Lines describing every metric that regressed by more than `threshold` (a fraction)"""
+    regressions = []
+    for scale, routes in results.items():
+        for route, metrics in routes.items():
+            previous = baseline.get(scale, {}).get(route)
+            if not previous:
+                continue
+            for name, higher_is_worse in COMPARED.items():
+                old, new = previous[name], metrics[name]
+                if not old:
+                    continue
+                change = (new - old) / old if higher_is_worse else (old - new) / old
+                limit = max(threshold, COLD_THRESHOLD) if name == 'cold_ms' else threshold
+                if change > limit and abs(new - old) > NOISE_FLOOR[name]:
+                    regressions.append(f"{scale}x {route} {name}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    def option(name, default):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    scales = [int(s) for s in option('--scales', '1,10,100').split(',')]
+    duration = float(option('--duration', 2))
+    threshold = float(option('--threshold', 0.25))
+    server = option('--server', 'inprocess')
+    concurrency = int(option('--concurrency', 10))
+    seed = int(option('--seed', 0))
+    cold_runs = int(option('--cold-runs', 5))
+    baseline_path = os.path.join(BENCHMARKS, f'baseline-{server}.json')
+    os.environ['NOBEL_METRICS'] = '1'
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp:
+        for scale in scales:
+            path, count = dataset(scale, temp, seed)
+            os.environ['NOBEL_DATA_FILE'] = path
+            print(f"{scale}x dataset ({count:,} laureates), {server}")
+            if server == 'gunicorn':
+                results[str(scale)] = run_gunicorn(duration, concurrency, cold_runs)
+            else:
+                results[str(scale)] = run_inprocess(duration, cold_runs)
+
+    memory_column = 'USS KB' if server == 'gunicorn' else 'alloc KB'
+    print(f"\n{'scale / route':<32}{'cold ms':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{memory_column:>11}")
+    for scale, routes in results.items():
+        print(f"{scale}x")
+        for route, r in routes.items():
+            print(f"  {route:<30}{r['cold_ms']:>9.1f}{r['rps']:>9.0f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+                  f"{r['p99_ms']:>9.2f}{r['memory_kb']:>11.0f}")
+
+    if '--save-baseline' in sys.argv:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'duration': duration, 'cold_runs': cold_runs, 'results': results}, f, indent=2, sort_keys=True)
+        print(f"\n✓ Saved baseline to {os.path.relpath(baseline_path, ROOT)}")
+        return
+
+    if not os.path.exists(baseline_path):
+        print(f"\n⚠ No baseline at {os.path.relpath(baseline_path, ROOT)}; run with --save-baseline to record one")
+        return
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, threshold)
+    if regressions:
+        print(f"\n⚠ {len(regressions)} regression(s) over {threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\n✓ No regressions over {threshold:.0%} against {os.path.relpath(baseline_path, ROOT)}")
+
+
+if __name__ == '__main__':
+    main()
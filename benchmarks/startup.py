@@ -0,0 +1,188 @@
+"""
+Startup-time budget for the web app
+Measures, each in a fresh interpreter (median of --runs):
+
+- import: `import app`, from `python -X importtime`, with the slowest of our own
+  modules and of the third-party packages listed so a new import-time cost shows up
+- phases: create_app(warm=False), the dataset load and warm_up(), i.e. the time
+  until /ready would answer 200
+- server (--server gunicorn|uvicorn): from spawning the server until GET /ready
+  returns 200
+
+and exits non-zero if import or time-to-ready is over budget, or if a module in
+LAZY_MODULES was imported at startup. tests/test_startup.py runs it with --json.
+
+    python benchmarks/startup.py [--runs 5] [--import-budget-ms 400] [--ready-budget-ms 800]
+                                 [--server gunicorn|uvicorn] [--server-budget-ms 3000] [--json]
+
+The budgets are for the real dataset on a developer machine; pass larger ones on
+slow CI runners. Flask and its dependencies are most of the import time; modules
+only the pipeline, the static export or the cProfile mode need are imported on
+first use, never at startup.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+
+# Top-level modules that belong to this repo (everything else is a dependency)
+OWN_MODULES = {os.path.splitext(name)[0] for name in os.listdir(ROOT) if name.endswith('.py')}
+
+IMPORT_BUDGET_MS = 400
+READY_BUDGET_MS = 800
+SERVER_BUDGET_MS = 3000
+
+# Modules that must not be imported when the app starts
+LAZY_MODULES = ['wiki_scraper', 'requests', 'bs4', 'brotli', 'cProfile', 'synthetic_data']
+
+PHASES_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app, nobel_api, nobel_data
+imported = time.perf_counter()
+application = app.create_app(warm=False)
+created = time.perf_counter()
+nobel_data.load_complete_data()
+loaded = time.perf_counter()
+nobel_api.warm_up()
+ready = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'load_ms': (loaded - created) * 1000,
+    'warm_ms': (ready - loaded) * 1000,
+    'ready_ms': (ready - start) * 1000,
+    'eager_modules': [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def import_times():
+    """{top-level package: cumulative import µs} for `import app`, from -X importtime"""
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, raw_name = line[len('import time:'):].split('|')
+        name = raw_name.strip()
+        # Our modules wherever they're imported from; dependencies only where `import app`
+        # (or site) imports them directly, their own imports are in that cumulative time
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        if name in OWN_MODULES or (depth <= 1 and '.' not in name):
+            times[name] = times.get(name, 0) + int(cumulative)
+    return times
+
+
+def run_phases():
+    process = subprocess.run([sys.executable, '-c', PHASES_SCRIPT], cwd=ROOT, capture_output=True,
+                             text=True, check=True)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def server_ready_ms(kind, port=8812):
+    """Milliseconds from spawning the server until /ready answers 200"""
+    if kind == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app',
+                   '--bind', f'127.0.0.1:{port}', '--access-logfile', '/dev/null']
+        env = dict(os.environ, WEB_CONCURRENCY='1')
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port),
+                   '--no-access-log', '--log-level', 'warning']
+        env = dict(os.environ)
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/ready', timeout=1).read()
+                return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"{kind} did not become ready on port {port}")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def measure(runs, server=None):
+    """
+    {'modules': {name: import ms}, 'phases': {phase_ms: ms}, 'eager_modules': [...],
+    'server_ready_ms': ms or None}, medians over `runs` fresh interpreters
+    """
+    samples = [import_times() for _ in range(runs)]
+    modules = {name: statistics.median(sample.get(name, 0) for sample in samples) / 1000
+               for name in samples[0]}
+    phases = [run_phases() for _ in range(runs)]
+    return {
+        'modules': modules,
+        'phases': {key: statistics.median(p[key] for p in phases) for key in phases[0] if key.endswith('_ms')},
+        'eager_modules': sorted({name for p in phases for name in p['eager_modules']}),
+        'server_ready_ms': statistics.median(server_ready_ms(server) for _ in range(runs)) if server else None,
+    }
+
+
+def check(results, import_budget=IMPORT_BUDGET_MS, ready_budget=READY_BUDGET_MS, server_budget=SERVER_BUDGET_MS):
+    """Lines describing every budget `results` (from measure()) is over"""
+    phases = results['phases']
+    failures = []
+    if phases['import_ms'] > import_budget:
+        failures.append(f"import {phases['import_ms']:.0f} ms > {import_budget:.0f} ms budget")
+    if phases['ready_ms'] > ready_budget:
+        failures.append(f"ready {phases['ready_ms']:.0f} ms > {ready_budget:.0f} ms budget")
+    if results['eager_modules']:
+        failures.append(f"imported at startup, should be lazy: {', '.join(results['eager_modules'])}")
+    if results['server_ready_ms'] is not None and results['server_ready_ms'] > server_budget:
+        failures.append(f"server ready {results['server_ready_ms']:.0f} ms > {server_budget:.0f} ms budget")
+    return failures
+
+
+def main():
+    def option(name, default):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    runs = int(option('--runs', 5))
+    import_budget = float(option('--import-budget-ms', IMPORT_BUDGET_MS))
+    ready_budget = float(option('--ready-budget-ms', READY_BUDGET_MS))
+    server = option('--server', None)
+    server_budget = float(option('--server-budget-ms', SERVER_BUDGET_MS))
+
+    results = measure(runs, server)
+    failures = check(results, import_budget, ready_budget, server_budget)
+    if '--json' in sys.argv:
+        print(json.dumps(dict(results, failures=failures), indent=2, sort_keys=True))
+        sys.exit(1 if failures else 0)
+
+    modules = results['modules']
+    own = sorted(((ms, name) for name, ms in modules.items() if name in OWN_MODULES and name != 'app'), reverse=True)
+    dependencies = sorted(((ms, name) for name, ms in modules.items() if name not in OWN_MODULES), reverse=True)
+    print(f"import app (-X importtime, median of {runs}): {modules.get('app', 0):.1f} ms")
+    print("  slowest own modules:   " + ', '.join(f"{name} {ms:.1f}" for ms, name in own[:6]))
+    print("  slowest dependencies:  " + ', '.join(f"{name} {ms:.1f}" for ms, name in dependencies[:6]))
+
+    print(f"\n{'phase':<16}{'ms':>8}")
+    for key in ('import_ms', 'create_app_ms', 'load_ms', 'warm_ms', 'ready_ms'):
+        print(f"  {key[:-3]:<14}{results['phases'][key]:>8.1f}")
+    if server:
+        print(f"\n{server} spawn -> /ready 200: {results['server_ready_ms']:.0f} ms")
+
+    if failures:
+        print("\n⚠ Over the startup budget:")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\n✓ Within budget (import {import_budget:.0f} ms, ready {ready_budget:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Static site export
+Writes every page and API response the map and table use into a directory
+that any static file server or CDN can serve with no Python in the request path:
+
+    flask --app app freeze [OUTPUT_DIR]
+
+- index.html and table.html, with the default map data inlined into index.html
+- static/ assets as-is
+- API responses under api/ with content-hashed names (api/stats.<hash>.json, ...),
+  and one file per laureate under api/laureate/<dataset version>/<id>.json
+- manifest.json mapping API URLs to files; index.html carries the same manifest so
+  app.js's apiUrl() requests the frozen files
+- .gz (and .br, if the brotli package is installed) next to every text file
+
+Serve table.html for /table (e.g. nginx `try_files $uri $uri.html`), and send the
+precompressed files where the server supports it (nginx gzip_static / brotli_static).
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+import click
+from flask import current_app, render_template
+from flask.cli import with_appcontext
+
+import nobel_api
+from nobel_data import get_all_laureates, get_load_info, load_complete_data
+from nobel_flows import LEVELS
+from nobel_stats import STAT_NAMES
+
+COMPRESSIBLE = ('.html', '.json', '.css', '.js', '.svg', '.txt')
+
+
+def api_urls():
+    """Every API URL the frozen site answers (apart from per-laureate details)"""
+    urls = []
+    for category in ['all'] + list(nobel_api.CATEGORIES):
+        urls.append(f'/api/laureates/{category}')
+        urls.append(f'/api/laureates/{category}?fields=map&format=columnar')
+    urls.append('/api/stats')
+    urls.extend(f'/api/stats/{name}' for name in STAT_NAMES)
+    urls.append('/api/flows')
+    for level in LEVELS:
+        for category in ['all'] + list(nobel_api.CATEGORIES):
+            urls.append(f'/api/flows?level={level}&category={category}')
+    return urls
+
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()[:10]
+
+
+def hashed_name(url, body):
+    """/api/laureates/all?fields=map&format=columnar -> api/laureates/all.fields-map.format-columnar.<hash>.json"""
+    path, _, query = url.partition('?')
+    name = path.lstrip('/')
+    if query:
+        name += '.' + '.'.join(part.replace('=', '-') for part in query.split('&'))
+    return f'{name}.{content_hash(body)}.json'
+
+
+def _brotli():
+    """The brotli module, or None if it isn't installed (imported on first use: freeze is CLI-only)"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def write_file(output_dir, name, body):
+    """Write a file plus its precompressed siblings. Returns the bytes written (uncompressed)"""
+    path = os.path.join(output_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(body)
+    if name.endswith(COMPRESSIBLE):
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(body, compresslevel=9, mtime=0))
+        brotli = _brotli()
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(body))
+    return len(body)
+
+
+def freeze(output_dir):
+    """Export the site into output_dir (replacing it). Returns the manifest"""
+    load_complete_data()
+    version = get_load_info()['version']
+
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+
+    files = {}
+    client = current_app.test_client()
+    for url in api_urls():
+        response = client.get(url)
+        body = response.get_data()
+        files[url] = hashed_name(url, body)
+        write_file(output_dir, files[url], body)
+
+    # One small file per laureate for the details fetched when a laureate is selected
+    laureate_dir = f'api/laureate/{version}/'
+    for laureates in get_all_laureates().values():
+        for laureate in laureates:
+            body, _ = nobel_api.laureate(laureate['laureate_id'])
+            write_file(output_dir, f"{laureate_dir}{laureate['laureate_id']}.json", body)
+
+    manifest = {
+        'version': version,
+        'files': files,
+        'prefixes': {'/api/laureate/': laureate_dir},
+    }
+    write_file(output_dir, 'manifest.json', json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+    # Pages
+    with current_app.test_request_context('/'):
+        index_html = render_template('index.html', categories=nobel_api.CATEGORIES,
+                                     bootstrap=nobel_api.bootstrap('all'), version=version,
+                                     api_manifest=json.dumps(manifest, separators=(',', ':')).replace('<', '\\u003c'))
+    write_file(output_dir, 'index.html', index_html.encode('utf-8'))
+    write_file(output_dir, 'table.html', client.get('/table').get_data())
+
+    # Assets
+    static_folder = current_app.static_folder
+    for root, _, names in os.walk(static_folder):
+        for name in names:
+            source = os.path.join(root, name)
+            with open(source, 'rb') as f:
+                write_file(output_dir, os.path.join('static', os.path.relpath(source, static_folder)), f.read())
+
+    return manifest
+
+
+@click.command('freeze')
+@click.argument('output_dir', default='build')
+@with_appcontext
+def freeze_command(output_dir):
+    """Export the site as static files into OUTPUT_DIR (default: build/)"""
+    manifest = freeze(output_dir)
+    total = sum(len(names) for _, _, names in os.walk(output_dir))
+    print(f"✓ Froze dataset {manifest['version']}: {len(manifest['files'])} API responses, "
+          f"{total} files in {output_dir}/")
+    if _brotli() is None:
+        print("  ⚠ brotli not installed - wrote .gz files only")
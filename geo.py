@@ -0,0 +1,100 @@
+"""
+Geographic helpers shared by the web app and the data pipeline
+"""
+
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between two points given in degrees"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def has_coords(lat, lon):
+    """(0, 0) is used throughout the data for "no coordinates" """
+    return lat != 0 or lon != 0
+
+
+def initial_bearing_deg(lat1, lon1, lat2, lon2):
+    """Initial compass bearing (0-360, 0 = north) from point 1 towards point 2"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dlambda = math.radians(lon2 - lon1)
+    x = math.sin(dlambda) * math.cos(phi2)
+    y = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(dlambda)
+    return (math.degrees(math.atan2(x, y)) + 360) % 360
+
+
+def unit_vector(lat, lon):
+    """Point on the unit sphere for a lat/lon in degrees"""
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def chord_to_km(chord):
+    """Straight-line distance between two unit-sphere points -> great-circle km"""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class KDTree:
+    """
+    Small 3-d KD-tree over unit-sphere coordinates.
+    Nearest in chord distance is nearest in great-circle distance, so this
+    answers "closest to (lat, lon)" without any special handling of the
+    date line or the poles.
+    """
+
+    def __init__(self, points):
+        """points: iterable of (lat, lon, item)"""
+        nodes = [(unit_vector(lat, lon), item) for lat, lon, item in points]
+        self.size = len(nodes)
+        self.root = self._build(nodes, 0)
+
+    def _build(self, nodes, depth):
+        if not nodes:
+            return None
+        axis = depth % 3
+        nodes.sort(key=lambda node: node[0][axis])
+        mid = len(nodes) // 2
+        return (nodes[mid], axis,
+                self._build(nodes[:mid], depth + 1),
+                self._build(nodes[mid + 1:], depth + 1))
+
+    def nearest(self, lat, lon, k=1):
+        """The k nearest items as a list of (distance_km, item), closest first"""
+        if k <= 0 or self.root is None:
+            return []
+        target = unit_vector(lat, lon)
+        best = []  # max-heap of (-squared chord distance, counter, item)
+        counter = 0
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            (point, item), axis, left, right = node
+            dist2 = sum((p - t) ** 2 for p, t in zip(point, target))
+            if len(best) < k:
+                heapq.heappush(best, (-dist2, counter, item))
+            elif dist2 < -best[0][0]:
+                heapq.heapreplace(best, (-dist2, counter, item))
+            counter += 1
+
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Only visit the far side if it could hold something closer
+            if len(best) < k or diff * diff < -best[0][0]:
+                stack.append(far)
+            stack.append(near)
+
+        return [(chord_to_km(math.sqrt(-neg)), item) for neg, _, item in sorted(best, reverse=True)]
@@ -0,0 +1,52 @@
+"""
+Gunicorn production profile
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app and dataset are loaded once in the master before forking (preload_app)
+and moved out of the garbage collector's reach with gc.freeze(), so workers share
+those pages copy-on-write instead of each holding a private copy.
+
+Tunable through the environment:
+- PORT                  listen port (default 8000)
+- WEB_CONCURRENCY       worker processes (default 2 x CPUs + 1)
+- GUNICORN_THREADS      threads per worker (default 4)
+- GUNICORN_TIMEOUT      worker timeout in seconds (default 30)
+- NOBEL_WARM            eager (default) or background: each worker starts
+                        serving at once and warms up in a thread (/ready is 503
+                        until then); turns preload off, as the thread can't cross a fork
+"""
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+preload_app = os.environ.get('NOBEL_WARM', 'eager') != 'background'
+
+accesslog = '-'
+
+# No collections in the master while the app loads, so the loaded objects
+# stay packed together instead of leaving freed holes in shared pages
+gc.disable()
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far to the permanent generation: the workers'
+    # collections then never write to those objects' GC headers
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
+
+
+def post_worker_init(worker):
+    # Every worker keeps its own LRU index of the tile cache directory, so each
+    # gets its share of NOBEL_TILE_CACHE_MB
+    import tiles
+    tiles.share_cache(worker.wsgi, worker.cfg.workers)
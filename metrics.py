@@ -0,0 +1,223 @@
+"""
+Prometheus metrics
+WSGI middleware around the Flask app that records, per route pattern, method and
+status: request counts, latency histograms and response size histograms. /metrics
+serves them in the Prometheus text format, together with dataset load time and
+size, cache hit/miss counters and process memory. On by default; NOBEL_METRICS=0
+turns it off.
+
+Latency runs until the last byte of the body has been handed to the server, so
+streamed pages (/table on a cache miss) are measured in full. Metrics are kept
+per process: under gunicorn each scrape is answered by one worker, so scrape
+each worker or run a single worker where exact totals matter.
+"""
+import bisect
+import os
+import resource
+import threading
+import time
+
+from flask import Blueprint, Response, current_app, request
+
+import nobel_api
+from nobel_data import get_cache_stats, get_load_info
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds, in seconds and bytes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# environ key the matched route pattern is passed to the middleware under
+ROUTE_KEY = 'nobel.route'
+
+bp = Blueprint('metrics', __name__)
+
+
+class Histogram:
+    """Bucket counts for one label set; `counts` are per bucket, made cumulative on output"""
+
+    __slots__ = ('counts', 'sum')
+
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, buckets, value):
+        self.counts[bisect.bisect_left(buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    """Request histograms keyed by (route, method, status)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.size = {}
+        self.started = time.time()
+
+    def observe(self, labels, seconds, size):
+        with self.lock:
+            latency = self.latency.get(labels)
+            if latency is None:
+                latency = self.latency[labels] = Histogram(LATENCY_BUCKETS)
+                self.size[labels] = Histogram(SIZE_BUCKETS)
+            latency.observe(LATENCY_BUCKETS, seconds)
+            self.size[labels].observe(SIZE_BUCKETS, size)
+
+    def snapshot(self):
+        with self.lock:
+            return ({labels: (list(h.counts), h.sum) for labels, h in self.latency.items()},
+                    {labels: (list(h.counts), h.sum) for labels, h in self.size.items()})
+
+
+class _Body:
+    """Response iterable that counts bytes and records the request when the server closes it"""
+
+    def __init__(self, iterable, registry, environ, status, start):
+        self.iterable = iterable
+        self.registry = registry
+        self.environ = environ
+        self.status = status
+        self.start = start
+        self.size = 0
+
+    def __iter__(self):
+        for chunk in self.iterable:
+            self.size += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            if hasattr(self.iterable, 'close'):
+                self.iterable.close()
+        finally:
+            labels = (self.environ.get(ROUTE_KEY, 'unmatched'), self.environ['REQUEST_METHOD'], self.status[0])
+            self.registry.observe(labels, time.perf_counter() - self.start, self.size)
+
+
+class MetricsMiddleware:
+    def __init__(self, wsgi_app, registry):
+        self.wsgi_app = wsgi_app
+        self.registry = registry
+
+    def __call__(self, environ, start_response):
+        start = time.perf_counter()
+        status = ['500']
+
+        def record_status(status_line, headers, exc_info=None):
+            status[0] = status_line[:3]
+            return start_response(status_line, headers, exc_info)
+
+        return _Body(self.wsgi_app(environ, record_status), self.registry, environ, status, start)
+
+
+def _labels(names, values):
+    escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+def _histogram_lines(name, help, buckets, histograms):
+    lines = [f'# HELP {name} {help}', f'# TYPE {name} histogram']
+    for labels, (counts, total) in sorted(histograms.items()):
+        label_text = _labels(('route', 'method', 'status'), labels)
+        cumulative = 0
+        for bound, count in zip(buckets, counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {cumulative}')
+        lines.append(f'{name}_sum{{{label_text}}} {total}')
+        lines.append(f'{name}_count{{{label_text}}} {cumulative}')
+    return lines
+
+
+def _metric(name, type, help, samples):
+    """samples: [(label text, value)]"""
+    lines = [f'# HELP {name} {help}', f'# TYPE {name} {type}']
+    for label_text, value in samples:
+        lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+    return lines
+
+
+def memory_usage():
+    """Resident, unique (private to this process) and peak resident memory in bytes; Linux /proc, else peak only"""
+    usage = {'peak': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line and not line.startswith(' '))
+        kb = {name: int(value.split()[0]) for name, value in fields.items() if value.strip().endswith('kB')}
+        usage['resident'] = kb['Rss'] * 1024
+        usage['unique'] = (kb['Private_Clean'] + kb['Private_Dirty']) * 1024
+    except (OSError, KeyError, ValueError):
+        pass
+    return usage
+
+
+def render(registry):
+    """Everything in the Prometheus text exposition format"""
+    latency, size = registry.snapshot()
+    lines = []
+    lines += _histogram_lines('nobel_http_request_duration_seconds', 'Time from request to last response byte',
+                              LATENCY_BUCKETS, latency)
+    lines += _histogram_lines('nobel_http_response_size_bytes', 'Response body size (as sent, after compression)',
+                              SIZE_BUCKETS, size)
+
+    info = get_load_info()
+    if info['loads']:
+        lines += _metric('nobel_dataset_info', 'gauge', 'Loaded dataset file and version',
+                         [(_labels(('file', 'version'), (os.path.basename(info['file']), info['version'])), 1)])
+        lines += _metric('nobel_dataset_load_seconds', 'gauge', 'Time the last dataset load took',
+                         [('', info['seconds'])])
+        lines += _metric('nobel_dataset_bytes', 'gauge', 'Size of the loaded data file', [('', info['bytes'])])
+        lines += _metric('nobel_dataset_laureates', 'gauge', 'Laureates in the loaded dataset',
+                         [('', info['laureates'])])
+        lines += _metric('nobel_dataset_loaded_timestamp_seconds', 'gauge', 'When the dataset was loaded',
+                         [('', info['loaded_at'])])
+    lines += _metric('nobel_dataset_loads_total', 'counter', 'Dataset loads and reloads', [('', info['loads'])])
+
+    caches = {'derived': get_cache_stats(), 'projection': nobel_api.projection_cache_stats()}
+    proxy = current_app.extensions.get('tile_proxy')
+    if proxy is not None:
+        caches['tile'] = {'hits': proxy.cache.hits, 'misses': proxy.cache.misses}
+        lines += _metric('nobel_tile_upstream_fetches_total', 'counter', 'Tiles fetched from the upstream server',
+                         [('', proxy.upstream_fetches)])
+        lines += _metric('nobel_tile_cache_bytes', 'gauge', 'Size of the tiles on disk',
+                         [('', proxy.cache.total_bytes)])
+    for kind in ('hits', 'misses'):
+        lines += _metric(f'nobel_cache_{kind}_total', 'counter', f'Cache {kind} by cache',
+                         [(_labels(('cache',), (name,)), stats[kind]) for name, stats in caches.items()])
+
+    memory = memory_usage()
+    for kind, help in (('resident', 'Resident set size'),
+                       ('unique', 'Memory private to this process (USS), i.e. not shared with other workers'),
+                       ('peak', 'Peak resident set size')):
+        if kind in memory:
+            lines += _metric(f'nobel_process_{kind}_memory_bytes', 'gauge', help, [('', memory[kind])])
+    lines += _metric('nobel_process_start_time_seconds', 'gauge', 'When this process started serving',
+                     [('', registry.started)])
+    return '\n'.join(lines) + '\n'
+
+
+@bp.route('/metrics')
+def metrics():
+    return Response(render(current_app.extensions['metrics']), content_type=CONTENT_TYPE)
+
+
+def init_app(app):
+    """Wrap the app in MetricsMiddleware and serve /metrics, unless NOBEL_METRICS=0"""
+    app.config.setdefault('METRICS', os.environ.get('NOBEL_METRICS', '1') == '1')
+    if not app.config['METRICS']:
+        return
+
+    registry = app.extensions['metrics'] = Registry()
+    app.wsgi_app = MetricsMiddleware(app.wsgi_app, registry)
+    app.register_blueprint(bp)
+
+    @app.before_request
+    def record_route():
+        # The URL rule (/api/laureates/<category>) rather than the path, so label
+        # values stay bounded however many distinct URLs are requested
+        if request.url_rule is not None:
+            request.environ[ROUTE_KEY] = request.url_rule.rule
@@ -0,0 +1,409 @@
+"""
+Nobel Prize API responses
+Response bodies for the /api/* endpoints, shared by the Flask views (app.py) and
+the ASGI app (asgi.py). Each handler takes the path parameters, a dict of query
+arguments and the media type picked by negotiate(), and returns (body bytes, status).
+Responses that don't depend on query arguments are encoded once per data load
+(per media type) and served from memory.
+"""
+
+import json
+import math
+import threading
+import time
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+from geo import has_coords
+from nobel_data import get_derived, get_all_laureates, get_nobel_laureates, load_complete_data, \
+    get_load_info, nearest_laureates, find_laureate
+from nobel_stats import get_stats, get_stat
+from nobel_flows import LEVELS, get_flows
+
+# Nobel Prize categories
+CATEGORIES = {
+    'physics': 'Physics',
+    'chemistry': 'Chemistry',
+    'medicine': 'Physiology or Medicine',
+    'literature': 'Literature',
+    'peace': 'Peace',
+    'economics': 'Economic Sciences'
+}
+
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+CBOR = 'application/cbor'
+
+
+def _encode_json(payload):
+    """Encoded the way Flask's jsonify does (compact, sorted keys, trailing newline)"""
+    return (json.dumps(payload, sort_keys=True, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+# Media type -> encoder; the binary ones only if their package is installed
+ENCODERS = {JSON: _encode_json}
+if msgpack is not None:
+    ENCODERS[MSGPACK] = msgpack.packb
+if cbor2 is not None:
+    ENCODERS[CBOR] = cbor2.dumps
+
+# Other names clients send for the same encodings
+MEDIA_TYPE_ALIASES = {
+    'application/x-msgpack': MSGPACK,
+    'application/vnd.msgpack': MSGPACK,
+}
+
+
+def negotiate(accept):
+    """
+    Media type to answer with for an Accept header: the supported type with the
+    highest q-value, JSON for anything else (including */* and no header)
+    """
+    best, best_q = JSON, 0.0
+    for item in (accept or '').split(','):
+        media_type, _, params = item.strip().partition(';')
+        media_type = MEDIA_TYPE_ALIASES.get(media_type.strip().lower(), media_type.strip().lower())
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in ENCODERS and q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def encode(payload, media_type=JSON):
+    return ENCODERS[media_type](payload)
+
+
+def error(message, status, media_type=JSON):
+    return encode({'error': message}, media_type), status
+
+
+def arg(args, name, default=None, type=None):
+    """Query argument `name` converted with `type`; `default` if missing or not convertible"""
+    value = args.get(name)
+    if value is None:
+        return default
+    if type is None:
+        return value
+    try:
+        return type(value)
+    except ValueError:
+        return default
+
+
+def positive_int(args, name):
+    """Query argument `name` as an integer >= 1, None if missing; ValueError if it's anything else"""
+    value = args.get(name)
+    if value is None:
+        return None
+    number = int(value)
+    if number < 1:
+        raise ValueError(f"{name} must be at least 1")
+    return number
+
+
+def cached(key, build, media_type=JSON):
+    """Build the payload once per data load, and encode it once per media type"""
+    payload = get_derived(f'payload:{key}', lambda data: build())
+    return get_derived(f'response:{key}:{media_type}', lambda data: encode(payload, media_type))
+
+
+# What the map needs for markers, cards and connections (?fields=map); the heavy
+# achievement text is fetched per laureate from /api/laureate/<id> when shown
+MAP_FIELDS = ['laureate_id', 'name', 'category', 'prize_year', 'work_location', 'work_lat', 'work_lon',
+              'work_years', 'birth_location', 'birth_lat', 'birth_lon', 'shared_with']
+
+# Columns sent as indexes into a list of distinct values in format=columnar
+DICTIONARY_FIELDS = ['category', 'work_location', 'birth_location']
+
+FORMATS = ['json', 'columnar']
+
+# Projected responses are cached per (category, fields, format), up to this many
+PROJECTION_CACHE_SIZE = 64
+
+_projection_stats = {'hits': 0, 'misses': 0}
+
+
+def _records(category):
+    """
+    Laureates of a category, as stored; for 'all', copies with their category key added
+    (like the unprojected responses, where only /api/laureates/all has a category per laureate)
+    """
+    if category != 'all':
+        return get_nobel_laureates(category)
+    return [dict(laureate, category=cat_key) for cat_key, cat_laureates in get_all_laureates().items()
+            for laureate in cat_laureates]
+
+
+def _field_names(category):
+    """Fields that can be projected for a category, found once per data load"""
+    def build(data):
+        names = {'category'}
+        for record in _records(category):
+            names.update(record)
+        return frozenset(names)
+    return get_derived(f'field_names:{category}', build)
+
+
+def to_columnar(records, fields):
+    """
+    Parallel arrays instead of an array of objects:
+    {"count", "fields", "columns": {field: [...]}, "dictionaries": {field: [distinct values]}}
+    Columns in DICTIONARY_FIELDS hold indexes into their dictionary.
+    """
+    columns = {}
+    dictionaries = {}
+    for field in fields:
+        values = [record.get(field) for record in records]
+        if field in DICTIONARY_FIELDS:
+            positions = {}
+            columns[field] = [positions.setdefault(value, len(positions)) for value in values]
+            dictionaries[field] = list(positions)
+        else:
+            columns[field] = values
+    return {
+        'count': len(records),
+        'fields': fields,
+        'columns': columns,
+        'dictionaries': dictionaries,
+    }
+
+
+def bootstrap(category='all'):
+    """
+    The map payload (fields=map, format=columnar) as JSON that is safe to inline
+    in a <script> tag, built once per data load
+    """
+    def build(data):
+        payload = {'category': CATEGORIES.get(category, 'All Categories')}
+        payload.update(to_columnar(_records(category), MAP_FIELDS))
+        return json.dumps(payload, separators=(',', ':')).replace('<', '\\u003c')
+    return get_derived(f'bootstrap:{category}', build)
+
+
+def _projected(category, fields, format, media_type=JSON):
+    records = _records(category)
+    known = _field_names(category)
+    if fields is None:
+        fields = sorted(known)
+    unknown = [field for field in fields if field not in known]
+    if unknown:
+        return error(f"Unknown field(s): {', '.join(unknown)}", 400, media_type)
+
+    payload = {'category': CATEGORIES.get(category, 'All Categories')}
+    if format == 'columnar':
+        payload.update(to_columnar(records, fields))
+    else:
+        payload['laureates'] = [{field: record.get(field) for field in fields} for record in records]
+    return encode(payload, media_type), 200
+
+
+def laureates(category, args=None, media_type=JSON):
+    """
+    /api/laureates/<category>
+    ?fields=name,prize_year,... (or fields=map for MAP_FIELDS) keeps only those fields;
+    ?format=columnar returns parallel arrays instead of objects. Records only carry a
+    category for 'all'; in a single category it's in the payload's "category" instead.
+    """
+    if category != 'all' and category not in CATEGORIES:
+        return error('Category not found', 404, media_type)
+
+    args = args or {}
+    format = arg(args, 'format', 'json')
+    if format not in FORMATS:
+        return error(f"format must be one of: {', '.join(FORMATS)}", 400, media_type)
+    fields = arg(args, 'fields')
+    if fields is not None:
+        fields = MAP_FIELDS if fields == 'map' else list(dict.fromkeys(f for f in fields.split(',') if f))
+        if not fields:
+            return error('fields must name at least one field', 400, media_type)
+
+    if fields is not None or format != 'json':
+        key = (category, tuple(fields) if fields is not None else None, format, media_type)
+        responses = get_derived('response:projections', lambda data: {})
+        if key in responses:
+            _projection_stats['hits'] += 1
+            return responses[key]
+        _projection_stats['misses'] += 1
+        response = _projected(category, fields, format, media_type)
+        if response[1] == 200 and len(responses) < PROJECTION_CACHE_SIZE:
+            responses[key] = response
+        return response
+
+    if category == 'all':
+        def build():
+            # Return all laureates with their category information
+            all_laureates = []
+            for cat_key, cat_laureates in get_all_laureates().items():
+                for laureate in cat_laureates:
+                    laureate_copy = laureate.copy()
+                    laureate_copy['category'] = cat_key
+                    all_laureates.append(laureate_copy)
+            return {
+                'category': 'All Categories',
+                'laureates': all_laureates
+            }
+        return cached('laureates:all', build, media_type), 200
+
+    return cached(f'laureates:{category}', lambda: {
+        'category': CATEGORIES[category],
+        'laureates': get_nobel_laureates(category)
+    }, media_type), 200
+
+
+def projection_cache_stats():
+    """Hits and misses of the ?fields=/?format= response cache"""
+    return dict(_projection_stats)
+
+
+def laureate(laureate_id, args=None, media_type=JSON):
+    """/api/laureate/<id>: every field of one laureate, including the ones left out of fields=map"""
+    found = find_laureate(laureate_id)
+    if found is None:
+        return error('Laureate not found', 404, media_type)
+    category, record = found
+    return encode(dict(record, category=category), media_type), 200
+
+
+def stats(args=None, media_type=JSON):
+    """/api/stats"""
+    return cached('stats', get_stats, media_type), 200
+
+
+def stat(name, args, media_type=JSON):
+    """/api/stats/<name>"""
+    data = get_stat(name)
+    if data is None:
+        return error('Statistic not found', 404, media_type)
+
+    try:
+        limit = positive_int(args, 'limit')
+    except ValueError:
+        return error('limit must be a positive integer', 400, media_type)
+    if limit is None or not isinstance(data, list):
+        return cached(f'stats:{name}', lambda: {'stat': name, 'data': data}, media_type), 200
+
+    return encode({
+        'stat': name,
+        'data': data[:limit]
+    }, media_type), 200
+
+
+def flows(args, media_type=JSON):
+    """/api/flows"""
+    level = arg(args, 'level', 'country')
+    category = arg(args, 'category', 'all')
+    level_flows = get_flows(level, category)
+    if level_flows is None:
+        return error('Unknown level or category', 404, media_type)
+
+    try:
+        min_count = positive_int(args, 'min_count') or 1
+        limit = positive_int(args, 'limit')
+    except ValueError:
+        return error('min_count and limit must be positive integers', 400, media_type)
+    if min_count > 1:
+        level_flows = [f for f in level_flows if f['count'] >= min_count]
+    if limit is not None:
+        level_flows = level_flows[:limit]
+
+    return encode({
+        'level': level,
+        'category': CATEGORIES.get(category, 'All Categories'),
+        'flows': level_flows
+    }, media_type), 200
+
+
+def nearest(args, media_type=JSON):
+    """
+    /api/nearest: the laureates who worked (or were born) closest to a point.
+    Takes lat=&lon= or laureate_id= (closest to that laureate's work location).
+    """
+    location = arg(args, 'location', 'work')
+    if location not in ('work', 'birth'):
+        return error('location must be work or birth', 400, media_type)
+    k = min(max(arg(args, 'k', 5, type=int), 1), 50)
+
+    laureate_id = arg(args, 'laureate_id')
+    if laureate_id:
+        found = find_laureate(laureate_id)
+        if found is None:
+            return error('Laureate not found', 404, media_type)
+        lat, lon = found[1]['work_lat'], found[1]['work_lon']
+        if not has_coords(lat, lon):
+            return error('Laureate has no work location coordinates', 404, media_type)
+        # Ask for one extra so the laureate itself can be dropped
+        results = [r for r in nearest_laureates(lat, lon, k + 1, location) if r[2]['laureate_id'] != laureate_id][:k]
+    else:
+        lat = arg(args, 'lat', type=float)
+        lon = arg(args, 'lon', type=float)
+        if lat is None or lon is None:
+            return error('lat and lon (or laureate_id) are required', 400, media_type)
+        if not (math.isfinite(lat) and math.isfinite(lon)) or abs(lat) > 90 or abs(lon) > 180:
+            return error('lat must be within -90..90 and lon within -180..180', 400, media_type)
+        results = nearest_laureates(lat, lon, k, location)
+
+    return encode({
+        'lat': lat,
+        'lon': lon,
+        'location': location,
+        'laureates': [
+            dict(laureate, category=category, distance_km=round(distance, 1))
+            for distance, category, laureate in results
+        ]
+    }, media_type), 200
+
+
+# Set once warm_up() has finished in this process; /ready answers 503 until then
+_ready = threading.Event()
+_warm_info = {}
+
+
+def warm_up():
+    """
+    Load the data and build everything derived from it (indexes, stats, flows,
+    encoded responses), so no request ever pays for the cold parse. Safe to call more than once.
+    """
+    start = time.perf_counter()
+    load_complete_data()
+    for level in LEVELS:
+        get_flows(level, 'all')
+    for media_type in ENCODERS:
+        stats(media_type=media_type)
+        for category in ['all'] + list(CATEGORIES):
+            laureates(category, media_type=media_type)
+        laureates('all', {'fields': 'map', 'format': 'columnar'}, media_type)
+    _warm_info['seconds'] = round(time.perf_counter() - start, 4)
+    _ready.set()
+    info = get_load_info()
+    print(f"✓ Loaded {info['laureates']} laureates from {info['file']} in {info['seconds'] * 1000:.0f} ms "
+          f"(ready in {_warm_info['seconds'] * 1000:.0f} ms)")
+
+
+def ready(args=None, media_type=JSON):
+    """/ready: 200 once the data, indexes and cached responses are built in this process, else 503"""
+    if not _ready.is_set():
+        return encode({'ready': False}, media_type), 503
+    info = get_load_info()
+    return encode({
+        'ready': True,
+        'version': info['version'],
+        'laureates': info['laureates'],
+        'load_seconds': info['seconds'],
+        'warm_seconds': _warm_info['seconds'],
+    }, media_type), 200
@@ -3,33 +3,110 @@ Nobel Prize data module
 Loads complete Nobel Prize laureate data from JSON file
 """
 
+import hashlib
 import json
 import os
+import sys
+import threading
+import time
+
+from geo import KDTree, has_coords
+
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nobel_data_complete.json')
+
+# Where the archived scraper with the sample data lives (only imported if the data file is missing)
+SAMPLE_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'old', 'old_pipeline_scripts')
 
 # Cache for the loaded data
 _cached_data = None
 
-def load_complete_data():
-    """Load complete Nobel Prize data from JSON file"""
-    global _cached_data
+# Values derived from the data (stats, indexes, ...), built once per data load
+_derived = {}
+
+# Held while loading or building a derived value, so each happens once per process
+# even when the first requests arrive concurrently
+_lock = threading.RLock()
+
+# How the current data was loaded (file, version, bytes, laureates, seconds, loaded_at, loads)
+_load_info = {'loads': 0}
+
+# get_derived() lookups that found / had to build their value. Hits are counted
+# without the lock, so under concurrent requests the count can come out slightly low
+_cache_stats = {'hits': 0, 'misses': 0}
 
+def data_file():
+    """Path of the data file: $NOBEL_DATA_FILE or nobel_data_complete.json next to this module"""
+    return os.environ.get('NOBEL_DATA_FILE', DEFAULT_DATA_FILE)
+
+def load_complete_data():
+    """Load complete Nobel Prize data from JSON file (once per process)"""
     if _cached_data is not None:
         return _cached_data
 
-    data_file = 'nobel_data_complete.json'
+    with _lock:
+        if _cached_data is None:
+            _load()
+    return _cached_data
 
-    if not os.path.exists(data_file):
-        print(f"Warning: {data_file} not found. Run fetch_nobel_data.py first.")
-        # Fall back to sample data
-        from wiki_scraper import get_comprehensive_sample_data
-        _cached_data = get_comprehensive_sample_data()
-        return _cached_data
+def _load():
+    global _cached_data, _derived
+    start = time.perf_counter()
+    path = data_file()
+
+    if not os.path.exists(path):
+        print(f"Warning: {path} not found. Run the pipeline in nobel_data_pipeline/ first.")
+        # Fall back to sample data; the archived scraper (and requests/bs4) are
+        # only imported here, never on a normal start
+        if SAMPLE_DATA_DIR not in sys.path:
+            sys.path.append(SAMPLE_DATA_DIR)
+        try:
+            from wiki_scraper import get_comprehensive_sample_data
+        except ImportError as e:
+            raise FileNotFoundError(f"{path} not found, and the sample data fallback is unavailable ({e})") from e
+        data = get_comprehensive_sample_data()
+        version = 'sample'
+        size = 0
+    else:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        size = len(raw)
+
+    _derived = {}
+    _cached_data = data
+
+    # Build the spatial indexes up front so the first query doesn't pay for it
+    for location in ('work', 'birth'):
+        _location_index(location)
 
-    with open(data_file, 'r', encoding='utf-8') as f:
-        _cached_data = json.load(f)
+    _load_info.update({
+        'file': path,
+        'version': version,
+        'bytes': size,
+        'laureates': sum(len(laureates) for laureates in data.values()),
+        'seconds': round(time.perf_counter() - start, 4),
+        'loaded_at': time.time(),
+        'loads': _load_info['loads'] + 1,
+    })
 
+def reload():
+    """Reload the data file (e.g. after the pipeline rewrote it) and drop everything derived from it"""
+    with _lock:
+        _load()
     return _cached_data
 
+def get_load_info():
+    """
+    How the current data was loaded: file, version (hash of the file contents),
+    bytes, laureates, seconds, loaded_at, loads
+    """
+    return dict(_load_info)
+
+def get_cache_stats():
+    """get_derived() hits and misses since the process started"""
+    return dict(_cache_stats)
+
 def get_nobel_laureates(category):
     """
     Get Nobel laureates for a specific category.
@@ -44,3 +121,52 @@ def get_all_laureates():
     Returns dictionary organized by category.
     """
     return load_complete_data()
+
+def get_derived(name, build):
+    """
+    Get a value computed from the complete data.
+    `build` is called with the data on first use and the result is cached
+    for as long as the data stays loaded.
+    """
+    derived = _derived
+    if name in derived:
+        _cache_stats['hits'] += 1
+        return derived[name]
+
+    with _lock:
+        data = load_complete_data()
+        if name not in _derived:
+            _cache_stats['misses'] += 1
+            _derived[name] = build(data)
+        else:
+            _cache_stats['hits'] += 1
+        return _derived[name]
+
+def build_location_index(all_data, location='work'):
+    """KD-tree over the work (or birth) coordinates of every laureate"""
+    points = []
+    for category, laureates in all_data.items():
+        for laureate in laureates:
+            lat = laureate[f'{location}_lat']
+            lon = laureate[f'{location}_lon']
+            if has_coords(lat, lon):
+                points.append((lat, lon, (category, laureate)))
+    return KDTree(points)
+
+def _location_index(location):
+    return get_derived(f'{location}_index', lambda data: build_location_index(data, location))
+
+def nearest_laureates(lat, lon, k=5, location='work'):
+    """
+    Get the k laureates whose work (or birth) location is closest to (lat, lon).
+    Returns a list of (distance_km, category, laureate), closest first.
+    """
+    index = _location_index(location)
+    return [(distance, category, laureate) for distance, (category, laureate) in index.nearest(lat, lon, k)]
+
+def find_laureate(laureate_id):
+    """Get (category, laureate) for a laureate id, or None"""
+    def build(all_data):
+        return {laureate['laureate_id']: (category, laureate)
+                for category, laureates in all_data.items() for laureate in laureates}
+    return get_derived('by_id', build).get(laureate_id)
@@ -0,0 +1,208 @@
+"""
+Columnar (Arrow/Parquet) export of nobel_data_complete.json plus a few query helpers
+Lets analytical questions run as vectorized scans instead of loops over nested dicts
+
+Needs pyarrow (pip install pyarrow); the web app does not.
+
+    python columnar.py ../nobel_data_complete.json          # write ../nobel_data_complete.parquet
+    python columnar.py ../nobel_data_complete.parquet       # run the example queries
+"""
+import json
+import os
+import sys
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _require_pyarrow():
+    if not HAVE_PYARROW:
+        raise ImportError("pyarrow is required for the columnar export: pip install pyarrow")
+
+
+def _schema():
+    dict_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('laureate_id', pa.string()),
+        ('name', pa.string()),
+        ('category', pa.dictionary(pa.int8(), pa.string())),
+        ('prize_year', pa.int16()),
+        ('birth_location', dict_string),
+        ('birth_place_id', pa.int32()),
+        ('birth_lat', pa.float64()),
+        ('birth_lon', pa.float64()),
+        ('work_location', dict_string),
+        ('work_place_id', pa.int32()),
+        ('work_lat', pa.float64()),
+        ('work_lon', pa.float64()),
+        ('work_years', pa.string()),
+        ('achievement', pa.string()),
+        ('shared_with', pa.list_(pa.string())),
+        ('birth_work_distance_km', pa.float64()),
+        ('birth_work_bearing_deg', pa.float64()),
+        ('data_source', pa.dictionary(pa.int8(), pa.string())),
+        ('needs_enrichment', pa.bool_()),
+    ])
+
+
+def _coord(lat, lon):
+    """(0, 0) means "missing" in the JSON; store it as null so scans skip it"""
+    if lat == 0 and lon == 0:
+        return None, None
+    return lat, lon
+
+
+def to_arrow_table(data):
+    """Flatten the category -> [laureate] JSON structure into one typed Arrow table"""
+    _require_pyarrow()
+
+    # One id per distinct place string, shared between birth and work columns
+    place_ids = {}
+
+    def place_id(location):
+        if not location:
+            return None
+        if location not in place_ids:
+            place_ids[location] = len(place_ids)
+        return place_ids[location]
+
+    columns = {field.name: [] for field in _schema()}
+    for category, laureates in data.items():
+        for l in laureates:
+            birth_lat, birth_lon = _coord(l.get('birth_lat', 0), l.get('birth_lon', 0))
+            work_lat, work_lon = _coord(l.get('work_lat', 0), l.get('work_lon', 0))
+            columns['laureate_id'].append(l['laureate_id'])
+            columns['name'].append(l['name'])
+            columns['category'].append(category)
+            columns['prize_year'].append(l['prize_year'])
+            columns['birth_location'].append(l.get('birth_location') or None)
+            columns['birth_place_id'].append(place_id(l.get('birth_location')))
+            columns['birth_lat'].append(birth_lat)
+            columns['birth_lon'].append(birth_lon)
+            columns['work_location'].append(l.get('work_location') or None)
+            columns['work_place_id'].append(place_id(l.get('work_location')))
+            columns['work_lat'].append(work_lat)
+            columns['work_lon'].append(work_lon)
+            columns['work_years'].append(l.get('work_years'))
+            columns['achievement'].append(l.get('achievement'))
+            columns['shared_with'].append(l.get('shared_with', []))
+            columns['birth_work_distance_km'].append(l.get('birth_work_distance_km'))
+            columns['birth_work_bearing_deg'].append(l.get('birth_work_bearing_deg'))
+            columns['data_source'].append(l.get('data_source'))
+            columns['needs_enrichment'].append(l.get('needs_enrichment'))
+
+    return pa.Table.from_pydict(columns, schema=_schema())
+
+
+def write_parquet(data, output_file):
+    """Write the dataset as a Parquet file. Returns the number of rows written"""
+    table = to_arrow_table(data)
+    pq.write_table(table, output_file, compression='zstd')
+    return table.num_rows
+
+
+def load_table(path):
+    """Load the Parquet export (or build the table straight from the JSON file)"""
+    _require_pyarrow()
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return to_arrow_table(json.load(f))
+    return pq.read_table(path)
+
+
+def count_by(table, keys):
+    """Count laureates per group, largest groups first"""
+    result = table.group_by(keys).aggregate([('laureate_id', 'count')])
+    result = result.rename_columns(list(keys) + ['laureates'])
+    return result.sort_by([('laureates', 'descending')])
+
+
+def with_decade(table):
+    """Add a `decade` column (1900, 1910, ...)"""
+    decade = pc.multiply(pc.divide(table['prize_year'].cast(pa.int32()), 10), 10)
+    return table.append_column('decade', decade)
+
+
+def laureates_per_city_per_decade(table):
+    """Laureate counts per work location per decade"""
+    table = with_decade(table).filter(pc.is_valid(table['work_location']))
+    return count_by(table, ['work_location', 'decade'])
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Vectorized great-circle distance between two sets of coordinates (degrees, Arrow arrays)"""
+    lat1, lon1, lat2, lon2 = (pc.multiply(c, 3.141592653589793 / 180) for c in (lat1, lon1, lat2, lon2))
+    dlat = pc.subtract(lat2, lat1)
+    dlon = pc.subtract(lon2, lon1)
+    a = pc.add(
+        pc.power(pc.sin(pc.divide(dlat, 2)), 2),
+        pc.multiply(pc.multiply(pc.cos(lat1), pc.cos(lat2)), pc.power(pc.sin(pc.divide(dlon, 2)), 2)),
+    )
+    return pc.multiply(pc.asin(pc.sqrt(pc.min_element_wise(a, 1.0))), 2 * EARTH_RADIUS_KM)
+
+
+def with_migration_km(table):
+    """Add a `migration_km` column: birth -> work distance (null where either is missing)"""
+    distance = haversine_km(table['birth_lat'], table['birth_lon'], table['work_lat'], table['work_lon'])
+    return table.append_column('migration_km', distance)
+
+
+def migration_distance_by_category(table):
+    """Mean / median / max birth -> work distance per category"""
+    table = with_migration_km(table)
+    table = table.filter(pc.is_valid(table['migration_km']))
+    result = table.group_by('category').aggregate([
+        ('migration_km', 'count'),
+        ('migration_km', 'mean'),
+        ('migration_km', 'approximate_median'),
+        ('migration_km', 'max'),
+    ])
+    return result.sort_by([('migration_km_mean', 'descending')])
+
+
+def _print_table(title, table, limit=10):
+    print(f"\n{title}")
+    print("-" * 70)
+    for row in table.slice(0, limit).to_pylist():
+        print("  " + "  ".join(f"{v:.1f}" if isinstance(v, float) else str(v) for v in row.values()))
+
+
+def main():
+    """Export JSON -> Parquet, or run the example queries against an export"""
+    _require_pyarrow()
+    if len(sys.argv) < 2:
+        print("Usage: python columnar.py <nobel_data_complete.json | nobel_data_complete.parquet>")
+        return
+
+    path = sys.argv[1]
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        output_file = os.path.splitext(path)[0] + '.parquet'
+        rows = write_parquet(data, output_file)
+        print(f"✓ Wrote {rows} rows to {output_file}")
+        return
+
+    table = load_table(path)
+    print(f"Loaded {table.num_rows} rows from {path}")
+
+    start = time.perf_counter()
+    per_city = laureates_per_city_per_decade(table)
+    by_category = migration_distance_by_category(table)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    _print_table("Laureates per work location per decade", per_city)
+    _print_table("Birth -> work distance (km) by category", by_category)
+    print(f"\nQueries took {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
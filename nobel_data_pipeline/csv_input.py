@@ -0,0 +1,194 @@
+"""
+Encoding-aware reader for the manually edited CSV files
+Detects the encoding once from a byte sample, decodes in a single streaming pass,
+repairs double-encoded (mojibake) text and reports the rows that needed fixing
+"""
+import codecs
+import csv
+import re
+import sys
+
+SAMPLE_SIZE = 64 * 1024
+
+# Candidates tried when the sample is not valid UTF-8, in order of preference.
+# mac_roman is here because spreadsheets exported from Numbers on macOS use it
+# (that's where "Bjerkeb\xbek" / "L\x9fbeck" in the step3 CSV came from).
+FALLBACK_ENCODINGS = ['cp1252', 'mac_roman', 'latin-1']
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# A run of non-ASCII characters; double-encoded UTF-8 always shows up as one
+NON_ASCII_RUN = re.compile(r'[^\x00-\x7f]{2,}')
+
+# A C1 control character, or a latin-1 symbol between two letters ("Bjerkeb¾k"):
+# a Mac Roman letter that was decoded as latin-1
+MISREAD_LETTER = re.compile(r'[\x80-\x9f]|(?<=[^\W\d_])[\xa0-\xff](?=[^\W\d_])')
+
+
+def _score_decoded(text):
+    """Score how plausible decoded text is: accented letters good, symbols/control chars bad"""
+    score = 0
+    for char in text:
+        if ord(char) < 128:
+            continue
+        if char.isalpha():
+            score += 1
+        else:
+            score -= 2
+    return score
+
+
+def detect_encoding(path, sample_size=SAMPLE_SIZE):
+    """Detect the encoding of a file from a byte sample (no full re-reads)"""
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is still UTF-8
+        if e.start >= len(sample) - 3 and e.reason == 'unexpected end of data':
+            return 'utf-8'
+
+    best_encoding = 'latin-1'
+    best_score = None
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            text = sample.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        score = _score_decoded(text)
+        if best_score is None or score > best_score:
+            best_encoding, best_score = encoding, score
+    return best_encoding
+
+
+def repair_mojibake(text, source_encoding='cp1252'):
+    """
+    Repair UTF-8 text that was decoded with a single-byte encoding,
+    e.g. "MÃ¼nchen" -> "München" or "Andriƒá" -> "Andrić", and Mac Roman text
+    decoded as latin-1, e.g. "Bjerkeb¾k" -> "Bjerkebæk"
+    """
+    if not text or text.isascii():
+        return text
+
+    candidates = [e for e in (source_encoding, 'cp1252', 'latin-1', 'mac_roman') if not e.startswith('utf')]
+    candidates = list(dict.fromkeys(candidates))
+
+    def fix_run(match):
+        run = match.group(0)
+        for encoding in candidates:
+            try:
+                return run.encode(encoding).decode('utf-8')
+            except (UnicodeEncodeError, UnicodeDecodeError, LookupError):
+                continue
+        return run
+
+    def fix_letter(match):
+        char = match.group(0)
+        if char.isalpha():
+            return char
+        fixed = char.encode('latin-1').decode('mac_roman')
+        return fixed if fixed.isalpha() else char
+
+    text = NON_ASCII_RUN.sub(fix_run, text)
+    if source_encoding != 'mac_roman':
+        text = MISREAD_LETTER.sub(fix_letter, text)
+    return text
+
+
+def iter_csv_rows(path, encoding=None, issues=None, key_field='laureate_id'):
+    """
+    Stream rows from a CSV file as dicts, decoding it exactly once.
+    Repaired or undecodable values are appended to `issues` (if given) as dicts.
+    """
+    if encoding is None:
+        encoding = detect_encoding(path)
+
+    with open(path, 'r', encoding=encoding, errors='replace', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            for field, value in row.items():
+                if not value or value.isascii():
+                    continue
+                repaired = repair_mojibake(value, encoding)
+                if repaired != value:
+                    row[field] = repaired
+                    problem = 'double_encoded'
+                elif '�' in value:
+                    problem = 'undecodable'
+                else:
+                    continue
+                if issues is not None:
+                    issues.append({
+                        'line': reader.line_num,
+                        'key': row.get(key_field, ''),
+                        'field': field,
+                        'problem': problem,
+                        'original': value,
+                        'repaired': repaired,
+                    })
+            yield row
+
+
+def read_csv(path, key_field='laureate_id'):
+    """Read a whole CSV file. Returns (rows, encoding, issues)"""
+    encoding = detect_encoding(path)
+    issues = []
+    rows = list(iter_csv_rows(path, encoding=encoding, issues=issues, key_field=key_field))
+    return rows, encoding, issues
+
+
+def print_issues(path, encoding, issues, limit=20):
+    """Print a short report of the rows that needed attention"""
+    print(f"  Encoding of {path}: {encoding}")
+    if encoding not in ('utf-8', 'utf-8-sig'):
+        print(f"  ⚠ Not UTF-8 - re-save as UTF-8 to avoid this next time")
+    if not issues:
+        return
+    print(f"  ⚠ {len(issues)} value(s) needed attention:")
+    for issue in issues[:limit]:
+        print(f"    line {issue['line']} {issue['key']} [{issue['field']}] {issue['problem']}: "
+              f"{issue['original']!r} -> {issue['repaired']!r}")
+    if len(issues) > limit:
+        print(f"    ... and {len(issues) - limit} more")
+
+
+def write_utf8(path, rows, fieldnames):
+    """Write rows back out as UTF-8"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    """Report (and optionally fix) encoding problems: python csv_input.py FILE... [--write]"""
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    write = '--write' in sys.argv
+
+    if not args:
+        print("Usage: python csv_input.py <file.csv> [more.csv ...] [--write]")
+        print("  --write  rewrite each file as repaired UTF-8 in place")
+        return
+
+    for path in args:
+        rows, encoding, issues = read_csv(path)
+        print(f"\n{path}: {len(rows)} rows")
+        print_issues(path, encoding, issues)
+        if write and rows and (issues or encoding not in ('utf-8', 'utf-8-sig')):
+            write_utf8(path, rows, list(rows[0].keys()))
+            print(f"  ✓ Rewrote {path} as UTF-8")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Shared geocoding cache for the pipeline scripts
+Every location string is geocoded at most once (ever): results, including
+failures, are kept in geocode_cache.json next to this file. Lookups go
+through geocode_many(), which deduplicates a whole batch first and only
+sends the misses to Nominatim, one per second.
+
+Only the real geocoder writes to geocode_cache.json by default: a stub or other
+injected geocoder gets a private in-memory cache unless the caller passes a
+cache_file, so fake coordinates never leak into later real runs.
+"""
+import json
+import os
+import re
+import time
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'geocode_cache.json')
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+USER_AGENT = 'NobelPrizeMap/1.0 (Educational Project)'
+RATE_LIMIT_SECONDS = 1.0  # Nominatim usage policy: max 1 request per second
+
+_caches = {}  # cache file -> {key: [lat, lon] or None}
+
+
+def normalize(location):
+    """Cache key for a location string"""
+    return re.sub(r'\s+', ' ', location or '').strip().lower()
+
+
+def load_cache(cache_file=CACHE_FILE):
+    """Load a cache file ({key: [lat, lon] or null}) into memory, once per file"""
+    cache = _caches.get(cache_file)
+    if cache is None:
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        else:
+            cache = {}
+        _caches[cache_file] = cache
+    return cache
+
+
+def save_cache(cache_file=CACHE_FILE):
+    """Write a loaded cache back to its file"""
+    cache = _caches.get(cache_file)
+    if cache is None:
+        return
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+
+def lookup(location, cache_file=CACHE_FILE):
+    """Cached coordinates as (lat, lon), None for a cached failure; KeyError if never geocoded"""
+    value = load_cache(cache_file)[normalize(location)]
+    return tuple(value) if value else None
+
+
+def store(location, coords, cache_file=CACHE_FILE):
+    """Put a result in the cache (coords may be None to remember a failure)"""
+    load_cache(cache_file)[normalize(location)] = list(coords) if coords else None
+
+
+def geocode_nominatim(location_string):
+    """Geocode a single location with Nominatim (no caching, no rate limiting)"""
+    import requests
+
+    params = {
+        'q': location_string,
+        'format': 'json',
+        'limit': 1
+    }
+    headers = {
+        'User-Agent': USER_AGENT
+    }
+    try:
+        response = requests.get(NOMINATIM_URL, params=params, headers=headers, timeout=10)
+        response.raise_for_status()
+        results = response.json()
+        if results:
+            return (float(results[0]['lat']), float(results[0]['lon']))
+    except Exception as e:
+        print(f"  ⚠ Geocoding error for '{location_string}': {e}")
+    return None
+
+
+def geocode_many(locations, aliases=None, geocoder=geocode_nominatim, retry_failures=False, rate_limit=None,
+                 cache_file=None):
+    """
+    Geocode a batch of location strings.
+    aliases: optional {location: query} - geocode `query` instead (e.g. the modern
+    name of a historical place) and cache the result under both strings.
+    rate_limit: seconds between geocoder calls (defaults to 1s for Nominatim, 0 for anything else).
+    cache_file: where results are read from and saved to; defaults to geocode_cache.json
+    for Nominatim, and to no file at all (a cache for this call only) for anything else.
+    Returns {location: (lat, lon) or None}. Each distinct query hits the geocoder at most once.
+    """
+    aliases = aliases or {}
+    real = geocoder is geocode_nominatim
+    if rate_limit is None:
+        rate_limit = RATE_LIMIT_SECONDS if real else 0
+    if cache_file is None and real:
+        cache_file = CACHE_FILE
+    cache = load_cache(cache_file) if cache_file else {}
+
+    def remember(location, coords):
+        cache[normalize(location)] = list(coords) if coords else None
+
+    def persist():
+        if cache_file:
+            save_cache(cache_file)
+
+    queries = {}
+    for location in locations:
+        if location:
+            queries[location] = aliases.get(location, location)
+
+    missing = []
+    seen = set()
+    for query in queries.values():
+        key = normalize(query)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key not in cache or (retry_failures and cache[key] is None):
+            missing.append(query)
+
+    if missing:
+        print(f"  Geocoding {len(missing)} new location(s) ({len(queries)} requested, rest cached)...")
+    for i, query in enumerate(missing, 1):
+        if i > 1 and rate_limit:
+            time.sleep(rate_limit)
+        remember(query, geocoder(query))
+        if i % 20 == 0:
+            print(f"    [{i}/{len(missing)}]")
+            persist()
+
+    results = {}
+    for location, query in queries.items():
+        coords = cache.get(normalize(query))
+        results[location] = tuple(coords) if coords else None
+        if query != location:
+            remember(location, coords)
+
+    if missing or aliases:
+        persist()
+    return results
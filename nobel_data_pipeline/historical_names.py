@@ -0,0 +1,140 @@
+"""
+Historical -> modern place-name table
+Turns strings like "Breslau (now Wroclaw), Prussia (now Poland)" into "Wroclaw, Poland"
+for geocoding. The table in historical_names.json is built from the dataset and
+can be extended by hand: entries under "manual" always win over "generated" ones.
+
+    python historical_names.py DATA.json [MORE.json ...]   # refresh the table
+    python historical_names.py DATA.json --geocode          # + geocode via the shared cache
+    python historical_names.py DATA.json --apply            # + fill (0, 0) coordinates in the file
+"""
+import json
+import os
+import re
+import sys
+
+from geocode_cache import geocode_many
+from location_parser import PART_SEPARATOR
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'historical_names.json')
+
+# "Breslau (now Wroclaw)" -> old="Breslau", note="now Wroclaw"
+PART_PATTERN = re.compile(r'^(?P<old>[^(]*?)\s*\((?P<note>[^)]*)\)\s*(?P<rest>.*)$')
+
+
+def modernize_part(part):
+    """One comma-separated part: "Breslau (now Wroclaw)" -> "Wroclaw", "Bucksburn (Scotland)" -> "Bucksburn" """
+    match = PART_PATTERN.match(part.strip())
+    if not match:
+        return part.strip()
+    note = match.group('note').strip()
+    if note.startswith('now '):
+        return note[4:].strip()
+    return (match.group('old') + ' ' + match.group('rest')).strip()
+
+
+def extract_modern_name(location):
+    """Modern form of a location string, or None if it has no historical annotations"""
+    if not location or '(' not in location:
+        return None
+    parts = [modernize_part(p) for p in PART_SEPARATOR.split(location)]
+    modern = ', '.join(p for p in parts if p)
+    return modern if modern != location else None
+
+
+def load_table(table_file=TABLE_FILE):
+    """Load {"manual": {...}, "generated": {...}}"""
+    if not os.path.exists(table_file):
+        return {'manual': {}, 'generated': {}}
+    with open(table_file, 'r', encoding='utf-8') as f:
+        table = json.load(f)
+    table.setdefault('manual', {})
+    table.setdefault('generated', {})
+    return table
+
+
+def save_table(table, table_file=TABLE_FILE):
+    """Write the table back, sorted so hand edits diff cleanly"""
+    with open(table_file, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+
+def dataset_locations(data):
+    """Every distinct birth/work location string in a dataset"""
+    return {laureate.get(field, '') for laureates in data.values()
+            for laureate in laureates for field in ('birth_location', 'work_location')} - {''}
+
+
+def build_table(data, table=None):
+    """Add a generated entry for every historical location in the dataset (manual entries are kept)"""
+    table = table or load_table()
+    for location in sorted(dataset_locations(data)):
+        if location in table['manual']:
+            continue
+        modern = extract_modern_name(location)
+        if modern:
+            table['generated'][location] = modern
+    return table
+
+
+def resolve_all(locations, table):
+    """{location: modern name} for every location that has one (manual first, then generated, then parsed)"""
+    resolved = {}
+    for location in locations:
+        modern = table['manual'].get(location) or table['generated'].get(location) or extract_modern_name(location)
+        if modern:
+            resolved[location] = modern
+    return resolved
+
+
+def geocode_historical(data, table):
+    """Geocode each historical place once, by its modern name, through the shared cache"""
+    aliases = resolve_all(dataset_locations(data), table)
+    return geocode_many(aliases.keys(), aliases=aliases)
+
+
+def apply_coordinates(data, coords):
+    """Fill (0, 0) birth/work coordinates from {location: (lat, lon)}. Returns the count updated"""
+    updated = 0
+    for laureates in data.values():
+        for laureate in laureates:
+            for prefix in ('birth', 'work'):
+                found = coords.get(laureate.get(f'{prefix}_location', ''))
+                if found and laureate[f'{prefix}_lat'] == 0 and laureate[f'{prefix}_lon'] == 0:
+                    laureate[f'{prefix}_lat'], laureate[f'{prefix}_lon'] = found
+                    updated += 1
+    return updated
+
+
+def main():
+    data_files = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not data_files:
+        print(__doc__)
+        return
+
+    datasets = {}
+    table = load_table()
+    for data_file in data_files:
+        with open(data_file, 'r', encoding='utf-8') as f:
+            datasets[data_file] = json.load(f)
+        table = build_table(datasets[data_file], table)
+    save_table(table)
+    print(f"✓ {len(table['generated'])} generated + {len(table['manual'])} manual entries in {TABLE_FILE}")
+
+    if '--geocode' not in sys.argv and '--apply' not in sys.argv:
+        return
+
+    for data_file, data in datasets.items():
+        coords = geocode_historical(data, table)
+        found = sum(1 for c in coords.values() if c)
+        print(f"✓ {data_file}: geocoded {found}/{len(coords)} historical places")
+
+        if '--apply' in sys.argv:
+            updated = apply_coordinates(data, coords)
+            with open(data_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            print(f"✓ Filled {updated} missing coordinate pairs in {data_file}")
+
+
+if __name__ == '__main__':
+    main()
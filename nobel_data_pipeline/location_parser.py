@@ -0,0 +1,302 @@
+"""
+Location parsing for affiliation / birthplace strings
+Splits strings like "Harvard University, Cambridge, MA, USA" into
+(institution, city, region, country) using one compiled, word-boundary-aware
+regex over countries, US states, historical names and aliases.
+
+    python location_parser.py ../nobel_data_complete.json
+"""
+import json
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+ParsedLocation = namedtuple('ParsedLocation', ['institution', 'city', 'region', 'country'])
+
+COUNTRIES = [
+    'Algeria', 'Argentina', 'Australia', 'Austria', 'Bangladesh', 'Belarus', 'Belgium',
+    'Bosnia and Herzegovina', 'Brazil', 'Bulgaria', 'Canada', 'Chile', 'China', 'Colombia',
+    'Costa Rica', 'Croatia', 'Cuba', 'Cyprus', 'Czech Republic', 'Democratic Republic of Congo',
+    'Denmark', 'East Timor', 'Egypt', 'Ethiopia', 'Finland', 'France', 'Gabon', 'Georgia', 'Germany', 'Ghana',
+    'Greece', 'Guatemala', 'Hungary', 'Iceland', 'India', 'Indonesia', 'Iran', 'Iraq', 'Ireland',
+    'Israel', 'Italy', 'Japan', 'Jordan', 'Kazakhstan', 'Kenya', 'Latvia', 'Lebanon', 'Liberia',
+    'Lithuania', 'Luxembourg', 'Madagascar', 'Mexico', 'Morocco', 'Myanmar', 'New Zealand',
+    'Nigeria', 'North Macedonia', 'Norway', 'Pakistan', 'Peru', 'Philippines', 'Poland',
+    'Portugal', 'Romania', 'Russia', 'Saint Lucia', 'Serbia', 'Singapore', 'Slovakia', 'Slovenia',
+    'South Africa', 'South Korea', 'Spain', 'Sweden', 'Switzerland', 'Taiwan', 'Tanzania',
+    'Trinidad and Tobago', 'Tunisia', 'Turkey', 'Ukraine', 'United Kingdom', 'USA', 'Venezuela',
+    'Vietnam', 'Yemen', 'Zimbabwe', 'the Netherlands',
+]
+
+# Other spellings -> canonical country name (as used in nobel_data_complete.json)
+COUNTRY_ALIASES = {
+    'United States': 'USA',
+    'United States of America': 'USA',
+    'U.S.A.': 'USA',
+    'U.S.': 'USA',
+    'US': 'USA',
+    'UK': 'United Kingdom',
+    'U.K.': 'United Kingdom',
+    'Great Britain': 'United Kingdom',
+    'Netherlands': 'the Netherlands',
+    'Holland': 'the Netherlands',
+    'Korea': 'South Korea',
+    'Republic of Korea': 'South Korea',
+    'Bosnia': 'Bosnia and Herzegovina',
+    'Czechia': 'Czech Republic',
+    'Burma': 'Myanmar',
+    'Persia': 'Iran',
+}
+
+# Historical states -> present-day country (None: keep the name as written)
+HISTORICAL_COUNTRIES = {
+    'Austria-Hungary': None,
+    'Austrian Empire': None,
+    'Belgian Congo': 'Democratic Republic of Congo',
+    'British India': 'India',
+    'British Mandate of Palestine': None,
+    'British Protectorate of Palestine': None,
+    'British West Indies': None,
+    'Czechoslovakia': None,
+    'Dutch East Indies': 'Indonesia',
+    'East Germany': 'Germany',
+    'Free City of Danzig': 'Poland',
+    'French Algeria': 'Algeria',
+    'French protectorate of Tunisia': 'Tunisia',
+    'German-occupied Poland': 'Poland',
+    'Gold Coast': 'Ghana',
+    'Ottoman Empire': None,
+    'Prussia': None,
+    'Russian Empire': None,
+    'Southern Rhodesia': 'Zimbabwe',
+    'USSR': None,
+    'West Germany': 'Germany',
+    'Yugoslavia': None,
+}
+
+US_STATES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'DC': 'District of Columbia',
+    'FL': 'Florida', 'GA': 'Georgia', 'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois',
+    'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas', 'KY': 'Kentucky', 'LA': 'Louisiana',
+    'ME': 'Maine', 'MD': 'Maryland', 'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota',
+    'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska', 'NV': 'Nevada',
+    'NH': 'New Hampshire', 'NJ': 'New Jersey', 'NM': 'New Mexico', 'NY': 'New York',
+    'NC': 'North Carolina', 'ND': 'North Dakota', 'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon',
+    'PA': 'Pennsylvania', 'RI': 'Rhode Island', 'SC': 'South Carolina', 'SD': 'South Dakota',
+    'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah', 'VT': 'Vermont', 'VA': 'Virginia',
+    'WA': 'Washington', 'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming',
+}
+
+# Sub-national regions -> the country they imply
+REGIONS = {
+    'England': 'United Kingdom', 'Scotland': 'United Kingdom', 'Wales': 'United Kingdom',
+    'Northern Ireland': 'United Kingdom',
+    'Ontario': 'Canada', 'Quebec': 'Canada', 'British Columbia': 'Canada', 'Alberta': 'Canada',
+    'Manitoba': 'Canada', 'Nova Scotia': 'Canada',
+    'Bavaria': 'Germany', 'Baden-Württemberg': 'Germany', 'Württemberg': 'Germany',
+    'Mecklenburg': 'Germany', 'Hesse-Kassel': 'Germany', 'Schleswig': 'Germany',
+    'East Friesland': 'Germany', 'East Prussia': None,
+    'Tuscany': 'Italy', 'Crete': 'Greece', 'Tibet': 'China',
+    'Faroe Islands': 'Denmark',
+}
+
+# Names that are both a country and a US state: the country, unless the string says
+# USA or the place before it is one of these cities of the state ("Atlanta, Georgia")
+STATE_CITIES = {
+    'Georgia': {'Atlanta', 'Athens', 'Augusta', 'Columbus', 'Decatur', 'Macon', 'Savannah'},
+}
+
+# The nations of the United Kingdom, and the counties that can come between them and
+# the town ("Hatfield, Hertfordshire, England")
+UK_NATIONS = {'England', 'Scotland', 'Wales', 'Northern Ireland'}
+UK_COUNTY = re.compile(
+    r'(?:\w+shire|Kent|Essex|(?:East |West )?Sussex|Surrey|Middlesex|Norfolk|Suffolk|Cornwall|Devon|'
+    r'Dorset|Cumbria|Durham|Northumberland|Rutland|Merseyside|Greater London|Greater Manchester|'
+    r'West Midlands|Tyne and Wear|Fife|(?:East |West )?Lothian|Midlothian|Glamorgan|Gwynedd|Powys|'
+    r'Dyfed|County \w+)'
+)
+
+
+def _build_terms():
+    """term (lower case) -> (kind, canonical name, country implied)"""
+    terms = {}
+    for country in COUNTRIES:
+        terms[country.lower()] = ('country', country, country)
+    for alias, country in COUNTRY_ALIASES.items():
+        if alias not in CODES:
+            terms[alias.lower()] = ('country', country, country)
+    for name, modern in HISTORICAL_COUNTRIES.items():
+        terms[name.lower()] = ('country', name, modern or name)
+    for region, country in REGIONS.items():
+        terms[region.lower()] = ('region', region, country)
+    for code, state in US_STATES.items():
+        # "Georgia" is the country here; parse_location() decides from context
+        # (STATE_CITIES), and "GA" is always the state
+        terms.setdefault(state.lower(), ('region', state, 'USA'))
+    return terms
+
+
+# Upper-case codes, matched case-sensitively so "in"/"or"/"me"/"us" in words never match
+CODES = {code: ('region', state, 'USA') for code, state in US_STATES.items()}
+CODES.update({alias: ('country', country, country) for alias, country in COUNTRY_ALIASES.items()
+              if len(alias) == 2})
+TERMS = _build_terms()
+
+
+def _build_pattern():
+    # Longest first, so "Austria-Hungary" wins over "Austria" and "New York" over "York"
+    names = sorted(TERMS, key=len, reverse=True)
+    codes = sorted(CODES, key=len, reverse=True)
+    name_alternation = '|'.join(re.escape(name) for name in names)
+    code_alternation = '|'.join(re.escape(code) for code in codes)
+    return re.compile(rf'(?<!\w)(?:(?i:{name_alternation})|{code_alternation})(?!\w)')
+
+
+GEO_PATTERN = _build_pattern()
+
+# "(now Poland)" / "(Denmark)" annotations
+PARENTHETICAL = re.compile(r'\s*\(([^)]*)\)')
+
+# Commas split parts, except inside "(now Boston, MA)"
+PART_SEPARATOR = re.compile(r',(?![^()]*\))')
+
+INSTITUTION_WORDS = re.compile(
+    r'\b(?:Universit\w*|Institut\w*|College|Laborator\w*|Labs?|Hospital|School|Academy|Society|'
+    r'Foundation|Company|Corporation|Inc|Ltd|Cent(?:er|re)|Museum|Observatory|Council|Agency|'
+    r'Organi[sz]ation|Bank|Clinic|Polytechnic|Technische|Hochschule|Faculty|Department)\b',
+    re.IGNORECASE,
+)
+
+
+def lookup_term(text):
+    """(kind, canonical, country) if the whole text is a known geographic term, else None"""
+    text = text.strip()
+    if text.startswith('the ') and text.lower() not in TERMS:
+        text = text[4:]
+    if not GEO_PATTERN.fullmatch(text):
+        return None
+    return CODES.get(text) or TERMS.get(text.lower())
+
+
+def find_terms(text):
+    """All geographic terms mentioned anywhere in free text, as (start, end, (kind, canonical, country))"""
+    found = []
+    for match in GEO_PATTERN.finditer(text):
+        term = CODES.get(match.group(0)) or TERMS.get(match.group(0).lower())
+        if term:
+            found.append((match.start(), match.end(), term))
+    return found
+
+
+def _classify_part(part):
+    """Look a comma-separated part up, preferring a "(now X)" modern name if it has one"""
+    modern = None
+    for note in PARENTHETICAL.findall(part):
+        note = note.strip()
+        if note.startswith('now '):
+            note = note[4:]
+        modern = lookup_term(note) or modern
+    bare = PARENTHETICAL.sub('', part).strip()
+    return bare, modern or lookup_term(bare)
+
+
+@lru_cache(maxsize=None)
+def parse_location(location):
+    """Parse one location string into a ParsedLocation (cached per unique string)"""
+    parts = [p.strip() for p in PART_SEPARATOR.split(location or '') if p.strip()]
+    if not parts:
+        return ParsedLocation('', '', '', '')
+
+    classified = [_classify_part(p) for p in parts]
+    i = len(classified) - 1
+    country = region = ''
+
+    bare, term = classified[i]
+    if term and term[0] == 'country':
+        country = term[2]
+        i -= 1
+        if i >= 0 and classified[i][0] in STATE_CITIES.get(country, ()):
+            region, country = country, 'USA'
+
+    if i >= 0 and not region:
+        bare, term = classified[i]
+        if term and country == 'USA' and term[1] in STATE_CITIES:
+            term = ('region', term[1], 'USA')
+        # "New York, USA" is a city; "Cambridge, NY, USA" and "Cambridge, MA" have a region
+        if term and term[0] == 'region' and (i > 0 or not country):
+            region = term[1]
+            country = country or (term[2] or '')
+            i -= 1
+
+    # "Hatfield, Hertfordshire, England": the county is the more precise region
+    if region in UK_NATIONS and i >= 1 and UK_COUNTY.fullmatch(classified[i][0]):
+        region = classified[i][0]
+        i -= 1
+
+    # What's left is institution names and places; "Mayfield, East Sussex" is city + region,
+    # "Harvard University, Cambridge" is institution + city
+    rest = [bare for bare, _ in classified[:i + 1]]
+    # A lone part is the city even if it reads like an institution ("College Park, MD")
+    places = rest if len(rest) == 1 else [bare for bare in rest if not INSTITUTION_WORDS.search(bare)]
+    city = places[-1] if places else ''
+    if not region and len(places) >= 2:
+        region, city = places[-1], places[-2]
+    named = {city, region}
+    institution = ', '.join(bare for bare in rest if bare not in named)
+    return ParsedLocation(institution, city, region, country)
+
+
+def parse_locations(locations):
+    """Parse many strings at once. Returns {string: ParsedLocation} for the unique strings"""
+    return {location: parse_location(location) for location in set(locations)}
+
+
+def parse_dataset(data, fields=('birth_location', 'work_location')):
+    """Parse every location string in a category -> [laureate] dataset in one batch"""
+    strings = [laureate.get(field, '') for laureates in data.values()
+               for laureate in laureates for field in fields]
+    return parse_locations(s for s in strings if s)
+
+
+def format_location(parsed, with_region=True):
+    """ParsedLocation -> "City, Region, Country" (no institution), for geocoding"""
+    parts = [parsed.city, parsed.region if with_region else '', parsed.country]
+    return ', '.join(p for p in parts if p)
+
+
+def main():
+    """Parse every location in a dataset and print a summary"""
+    if len(sys.argv) < 2:
+        print("Usage: python location_parser.py <nobel_data_complete.json>")
+        return
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    start = time.perf_counter()
+    parsed = parse_dataset(data)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    no_country = sorted(s for s, p in parsed.items() if not p.country)
+    with_institution = sorted(s for s, p in parsed.items() if p.institution)
+    countries = Counter(p.country for p in parsed.values() if p.country)
+
+    print(f"Parsed {len(parsed)} unique location strings in {elapsed:.1f} ms")
+    print(f"  With a country: {len(parsed) - len(no_country)}")
+    print(f"  With an institution part: {len(with_institution)}")
+    print(f"  Distinct countries: {len(countries)}")
+    if no_country:
+        print(f"\n⚠ No country recognised ({len(no_country)}):")
+        for s in no_country[:20]:
+            print(f"  - {s}")
+    if with_institution:
+        print(f"\nInstitution examples:")
+        for s in with_institution[:10]:
+            print(f"  {s} -> {tuple(parsed[s])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Manual override engine
+Applies manual_overrides.json ({laureate_id: {"work_location": ..., "note": ...}}) to a
+dataset as a single keyed join: all new locations are geocoded first as one
+deduplicated batch through the shared cache, then every override is applied
+and each changed field is recorded in a provenance log (JSON lines).
+
+    python overrides.py DATA.json manual_overrides.json [--output OUT.json] [--log overrides_log.jsonl]
+                        [--geocode-cache CACHE.json]
+"""
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from geocode_cache import geocode_many, geocode_nominatim
+from historical_names import load_table, resolve_all
+
+
+def load_overrides(path):
+    """Load overrides keyed by laureate_id, skipping "_comment"-style metadata keys"""
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    return {key: value for key, value in raw.items()
+            if not key.startswith('_') and isinstance(value, dict)}
+
+
+def index_by_id(data):
+    """{laureate_id: laureate} over every category"""
+    return {laureate['laureate_id']: laureate for laureates in data.values() for laureate in laureates}
+
+
+def geocode_override_locations(overrides, geocoder=geocode_nominatim, cache_file=None):
+    """
+    Geocode every location the overrides introduce, once each, as one batch.
+    cache_file: see geocode_many() - the shared cache for Nominatim, none for other geocoders.
+    """
+    locations = set()
+    for override in overrides.values():
+        for prefix in ('work', 'birth'):
+            location = override.get(f'{prefix}_location')
+            # Explicit coordinates in the override win; no need to geocode those
+            if location and f'{prefix}_lat' not in override:
+                locations.add(location)
+    aliases = resolve_all(locations, load_table())
+    return geocode_many(locations, aliases=aliases, geocoder=geocoder, cache_file=cache_file)
+
+
+def apply_overrides(data, overrides, geocoder=geocode_nominatim, source='manual_overrides.json', cache_file=None):
+    """
+    Apply overrides to `data` in place.
+    Returns (provenance, report): one provenance entry per changed field, and a
+    report with 'applied', 'unknown_ids' and 'geocode_failed' lists.
+    """
+    by_id = index_by_id(data)
+    joined = [(by_id[laureate_id], override) for laureate_id, override in overrides.items()
+              if laureate_id in by_id]
+    report = {
+        'applied': [],
+        'unknown_ids': sorted(set(overrides) - set(by_id)),
+        'geocode_failed': [],
+    }
+
+    coords = geocode_override_locations({l['laureate_id']: o for l, o in joined}, geocoder, cache_file)
+
+    timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    provenance = []
+
+    def set_field(laureate, field, value, note):
+        old = laureate.get(field)
+        if old == value:
+            return
+        laureate[field] = value
+        provenance.append({
+            'timestamp': timestamp,
+            'laureate_id': laureate['laureate_id'],
+            'field': field,
+            'old': old,
+            'new': value,
+            'source': source,
+            'note': note,
+        })
+
+    for laureate, override in joined:
+        note = override.get('note', '')
+        for prefix in ('work', 'birth'):
+            location = override.get(f'{prefix}_location')
+            if location:
+                set_field(laureate, f'{prefix}_location', location, note)
+            if f'{prefix}_lat' in override or f'{prefix}_lon' in override:
+                # Old format with explicit lat/lon
+                for field in (f'{prefix}_lat', f'{prefix}_lon'):
+                    if field in override:
+                        set_field(laureate, field, override[field], note)
+            elif location:
+                found = coords.get(location)
+                if found:
+                    set_field(laureate, f'{prefix}_lat', found[0], note)
+                    set_field(laureate, f'{prefix}_lon', found[1], note)
+                else:
+                    # Keep existing coordinates as fallback
+                    report['geocode_failed'].append({
+                        'laureate_id': laureate['laureate_id'],
+                        'name': laureate['name'],
+                        'location': location,
+                    })
+
+        # Mark as manually overridden
+        set_field(laureate, 'data_source', 'manual', note)
+        set_field(laureate, 'needs_enrichment', False, note)
+        if note:
+            set_field(laureate, 'manual_note', note, note)
+        report['applied'].append(laureate['laureate_id'])
+
+    return provenance, report
+
+
+def write_provenance(provenance, log_path):
+    """Append provenance entries to a JSON-lines log"""
+    with open(log_path, 'a', encoding='utf-8') as f:
+        for entry in provenance:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) < 2:
+        print(__doc__)
+        return
+
+    def option(name, default):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    data_file, overrides_file = args[0], args[1]
+    output_file = option('--output', data_file)
+    log_file = option('--log', os.path.join(os.path.dirname(os.path.abspath(output_file)), 'overrides_log.jsonl'))
+    cache_file = option('--geocode-cache', None)
+
+    print("=" * 80)
+    print("Applying manual overrides")
+    print("=" * 80)
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    overrides = load_overrides(overrides_file)
+    print(f"Loaded {len(overrides)} override(s) from {overrides_file}")
+
+    provenance, report = apply_overrides(data, overrides, cache_file=cache_file)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    write_provenance(provenance, log_file)
+
+    print(f"\n✓ Applied {len(report['applied'])} override(s), {len(provenance)} field change(s)")
+    print(f"✓ Saved to {output_file}; provenance appended to {log_file}")
+    if report['unknown_ids']:
+        print(f"⚠ {len(report['unknown_ids'])} override(s) for unknown laureate ids:")
+        for laureate_id in report['unknown_ids']:
+            print(f"  - {laureate_id}")
+    if report['geocode_failed']:
+        print(f"⚠ {len(report['geocode_failed'])} location(s) failed to geocode (old coordinates kept):")
+        for item in report['geocode_failed']:
+            print(f"  - {item['name']}: {item['location']}")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""
+Offline reverse geocoder for coordinate consistency checks
+Resolves every birth/work coordinate to a country (point-in-polygon over country
+boundaries) and a nearest city (KD-tree over city centroids), both loaded from
+local files, and flags records whose coordinates fall in a different country than
+the one named in the location text (e.g. Cambridge MA vs Cambridge UK).
+
+Data files (not committed; see README) go in geodata/:
+- countries.geojson - country boundaries, e.g. Natural Earth admin-0 countries
+- cities.csv        - city centroids with lat,lon,name[,cc] columns, or a GeoNames cities*.txt dump
+
+    python reverse_geocode.py ../nobel_data_complete.json [--countries FILE] [--cities FILE] [--report FILE]
+"""
+import csv
+import json
+import os
+import sys
+import time
+
+from location_parser import COUNTRIES, lookup_term, parse_location
+
+# geo.py lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geo import KDTree, has_coords
+
+GEODATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'geodata')
+COUNTRIES_FILE = os.path.join(GEODATA_DIR, 'countries.geojson')
+CITIES_FILE = os.path.join(GEODATA_DIR, 'cities.csv')
+
+GRID_DEGREES = 5
+
+# Boundary-file names that location_parser doesn't know
+BOUNDARY_NAME_ALIASES = {
+    'Dem. Rep. Congo': 'Democratic Republic of Congo',
+    'Democratic Republic of the Congo': 'Democratic Republic of Congo',
+    'Bosnia and Herz.': 'Bosnia and Herzegovina',
+    'Czech Rep.': 'Czech Republic',
+    'Republic of Korea': 'South Korea',
+    'Timor-Leste': 'East Timor',
+    'United Republic of Tanzania': 'Tanzania',
+    'Republic of Serbia': 'Serbia',
+}
+
+NAME_PROPERTIES = ['ADMIN', 'NAME', 'NAME_EN', 'admin', 'name']
+
+
+def canonical_country(name):
+    """Boundary-file country name -> the name used in location strings"""
+    name = BOUNDARY_NAME_ALIASES.get(name, name)
+    term = lookup_term(name)
+    return term[2] if term and term[0] == 'country' else name
+
+
+def _bbox(rings):
+    lons = [p[0] for ring in rings for p in ring]
+    lats = [p[1] for ring in rings for p in ring]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def _in_ring(lon, lat, ring):
+    """Even-odd ray casting"""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+class CountryIndex:
+    """Point-in-polygon lookup over country boundaries, with a coarse grid to skip most polygons"""
+
+    def __init__(self, geojson):
+        self.polygons = []  # (country, bbox, outer ring, holes)
+        self.grid = {}
+        for feature in geojson.get('features', []):
+            properties = feature.get('properties') or {}
+            name = next((properties[key] for key in NAME_PROPERTIES if properties.get(key)), None)
+            geometry = feature.get('geometry') or {}
+            if not name or geometry.get('type') not in ('Polygon', 'MultiPolygon'):
+                continue
+            polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+            for rings in polygons:
+                self._add(canonical_country(name), rings)
+
+    def _add(self, country, rings):
+        bbox = _bbox(rings[:1])
+        index = len(self.polygons)
+        self.polygons.append((country, bbox, rings[0], rings[1:]))
+        min_lon, min_lat, max_lon, max_lat = bbox
+        for gx in range(int(min_lon // GRID_DEGREES), int(max_lon // GRID_DEGREES) + 1):
+            for gy in range(int(min_lat // GRID_DEGREES), int(max_lat // GRID_DEGREES) + 1):
+                self.grid.setdefault((gx, gy), []).append(index)
+
+    def country_at(self, lat, lon):
+        """Country containing the point, or None (e.g. offshore on a coarse boundary file)"""
+        cell = (int(lon // GRID_DEGREES), int(lat // GRID_DEGREES))
+        for index in self.grid.get(cell, []):
+            country, (min_lon, min_lat, max_lon, max_lat), outer, holes = self.polygons[index]
+            if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+                continue
+            if _in_ring(lon, lat, outer) and not any(_in_ring(lon, lat, hole) for hole in holes):
+                return country
+        return None
+
+
+def load_country_index(path=COUNTRIES_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        return CountryIndex(json.load(f))
+
+
+def load_city_index(path=CITIES_FILE):
+    """KD-tree of (name, country code) over a city CSV or a GeoNames cities*.txt dump"""
+    points = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.txt'):
+            # GeoNames: geonameid, name, asciiname, alternatenames, lat, lon, ..., country code (col 8)
+            for row in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+                points.append((float(row[4]), float(row[5]), (row[1], row[8])))
+        else:
+            for row in csv.DictReader(f):
+                points.append((float(row['lat']), float(row['lon']),
+                               (row['name'], row.get('cc') or row.get('country', ''))))
+    return KDTree(points)
+
+
+def expected_country(location):
+    """Present-day country named in a location string, or None if unknown/historical"""
+    country = parse_location(location).country
+    return country if country in COUNTRIES else None
+
+
+def annotate(data, country_index, city_index=None):
+    """
+    Resolve every coordinate pair in one pass.
+    Returns a list of records: laureate_id, name, field, location, lat, lon,
+    expected_country, resolved_country, nearest_city, nearest_city_km, mismatch.
+    """
+    records = []
+    for laureates in data.values():
+        for laureate in laureates:
+            for prefix in ('work', 'birth'):
+                lat = laureate.get(f'{prefix}_lat', 0)
+                lon = laureate.get(f'{prefix}_lon', 0)
+                location = laureate.get(f'{prefix}_location', '')
+                if not has_coords(lat, lon):
+                    continue
+                expected = expected_country(location)
+                resolved = country_index.country_at(lat, lon)
+                record = {
+                    'laureate_id': laureate['laureate_id'],
+                    'name': laureate['name'],
+                    'field': prefix,
+                    'location': location,
+                    'lat': lat,
+                    'lon': lon,
+                    'expected_country': expected,
+                    'resolved_country': resolved,
+                    'mismatch': bool(expected and resolved and expected != resolved),
+                }
+                if city_index is not None:
+                    nearest = city_index.nearest(lat, lon, 1)
+                    if nearest:
+                        distance, (city, cc) = nearest[0]
+                        record['nearest_city'] = f"{city}, {cc}" if cc else city
+                        record['nearest_city_km'] = round(distance, 1)
+                records.append(record)
+    return records
+
+
+def check_consistency(data, countries_file=COUNTRIES_FILE, cities_file=CITIES_FILE):
+    """Annotate a dataset with whatever geodata files exist. Returns (records, mismatches), or None if no boundaries"""
+    if not os.path.exists(countries_file):
+        return None
+    country_index = load_country_index(countries_file)
+    city_index = load_city_index(cities_file) if cities_file and os.path.exists(cities_file) else None
+    records = annotate(data, country_index, city_index)
+    return records, [r for r in records if r['mismatch']]
+
+
+def print_mismatches(mismatches, limit=25):
+    print(f"⚠ {len(mismatches)} coordinate(s) fall outside the country named in the location:")
+    for r in mismatches[:limit]:
+        city = f" near {r['nearest_city']}" if r.get('nearest_city') else ''
+        print(f"  - {r['name']} ({r['laureate_id']}) {r['field']}: '{r['location']}' "
+              f"-> ({r['lat']:.3f}, {r['lon']:.3f}) is in {r['resolved_country']}{city}")
+    if len(mismatches) > limit:
+        print(f"  ... and {len(mismatches) - limit} more")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print(__doc__)
+        return
+
+    def option(name, default):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    countries_file = option('--countries', COUNTRIES_FILE)
+    cities_file = option('--cities', CITIES_FILE)
+    report_file = option('--report', None)
+
+    with open(args[0], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if not os.path.exists(countries_file):
+        print(f"❌ Country boundaries not found: {countries_file} (see README)")
+        return
+
+    start = time.perf_counter()
+    country_index = load_country_index(countries_file)
+    city_index = load_city_index(cities_file) if os.path.exists(cities_file) else None
+    loaded = time.perf_counter()
+    records = annotate(data, country_index, city_index)
+    done = time.perf_counter()
+
+    mismatches = [r for r in records if r['mismatch']]
+    unresolved = sum(1 for r in records if r['resolved_country'] is None)
+    print(f"Loaded {len(country_index.polygons)} boundary polygons"
+          f"{' and %d cities' % city_index.size if city_index else ''} in {(loaded - start) * 1000:.0f} ms")
+    print(f"Checked {len(records)} coordinates in {(done - loaded) * 1000:.0f} ms "
+          f"({unresolved} outside every boundary, e.g. on the coast)")
+    if mismatches:
+        print_mismatches(mismatches)
+    else:
+        print("✓ All coordinates fall in the country named in their location")
+
+    if report_file:
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        print(f"\nFull report saved to: {report_file}")
+
+
+if __name__ == '__main__':
+    main()
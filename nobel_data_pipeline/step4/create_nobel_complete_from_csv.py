@@ -4,10 +4,20 @@ Create nobel_data_complete.json by merging:
 - Corrected location names and coordinates from laureates_data_to_fill_filledcoords_final.csv
 """
 import json
-import csv
+import os
 import shutil
+import sys
 from datetime import datetime
 
+# Shared pipeline helpers live one directory up, geo.py at the repository root
+PIPELINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PIPELINE_DIR)
+sys.path.insert(0, os.path.dirname(PIPELINE_DIR))
+from csv_input import read_csv, print_issues
+from columnar import HAVE_PYARROW, write_parquet
+from geo import haversine_km, initial_bearing_deg, has_coords
+from reverse_geocode import check_consistency, print_mismatches
+
 def backup_json():
     """Create a timestamped backup of the existing JSON file"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -22,41 +32,49 @@ def backup_json():
 
 def load_csv_data(csv_file):
     """Load CSV data into a dictionary keyed by laureate_id"""
-    csv_data = {}
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            csv_data[row['laureate_id']] = row
-    return csv_data
-
-def main():
-    print("=" * 70)
-    print("Creating nobel_data_complete.json")
-    print("=" * 70)
-    print("Sources:")
-    print("  - Metadata: pipeline/data/01_raw_from_api.json")
-    print("  - Locations: laureates_data_to_fill_filledcoords_final.csv")
-    print("=" * 70)
-
-    # Backup existing JSON
-    backup_file = backup_json()
-
-    # Load CSV data
-    print("\nLoading CSV data...")
-    csv_data = load_csv_data('laureates_data_to_fill_filledcoords_final.csv')
-    print(f"✓ Loaded {len(csv_data)} laureates from CSV")
-
-    # Load API JSON
-    print("\nLoading API data...")
-    with open('pipeline/data/01_raw_from_api.json', 'r', encoding='utf-8') as f:
-        api_data = json.load(f)
-
-    # Count total laureates in API data
-    total_api = sum(len(laureates) for laureates in api_data.values())
-    print(f"✓ Loaded {total_api} laureates from API JSON")
+    rows, encoding, issues = read_csv(csv_file)
+    print_issues(csv_file, encoding, issues)
+    return {row['laureate_id']: row for row in rows}
+
+def add_distance_fields(api_data):
+    """
+    Store physical distances on every laureate:
+    - birth_work_distance_km / birth_work_bearing_deg (None if either location has no coordinates)
+    - co_laureate_distances_km: {co-laureate id: km between their work locations}
+    """
+    work_coords = {}
+    for laureates in api_data.values():
+        for laureate in laureates:
+            if has_coords(laureate['work_lat'], laureate['work_lon']):
+                work_coords[laureate['laureate_id']] = (laureate['work_lat'], laureate['work_lon'])
 
-    # Update API data with CSV locations
-    print("\nMerging location data from CSV...")
+    with_distance = 0
+    for laureates in api_data.values():
+        for laureate in laureates:
+            birth = (laureate['birth_lat'], laureate['birth_lon'])
+            work = work_coords.get(laureate['laureate_id'])
+            if work and has_coords(*birth):
+                laureate['birth_work_distance_km'] = round(haversine_km(*birth, *work), 1)
+                laureate['birth_work_bearing_deg'] = round(initial_bearing_deg(*birth, *work), 1)
+                with_distance += 1
+            else:
+                laureate['birth_work_distance_km'] = None
+                laureate['birth_work_bearing_deg'] = None
+
+            co_distances = {}
+            if work:
+                for co_id in laureate.get('shared_with', []):
+                    if co_id in work_coords:
+                        co_distances[co_id] = round(haversine_km(*work, *work_coords[co_id]), 1)
+            laureate['co_laureate_distances_km'] = co_distances
+
+    return with_distance
+
+def merge_csv_locations(api_data, csv_data):
+    """
+    Overwrite location names and coordinates in api_data with the CSV rows.
+    Returns (updated, missing in CSV, unused CSV rows)
+    """
     updated_count = 0
     missing_in_csv = 0
     csv_used = set()
@@ -104,11 +122,66 @@ def main():
     if unused_csv > 0:
         print(f"  ⚠ Warning: {unused_csv} CSV entries not found in API data")
 
+    return updated_count, missing_in_csv, unused_csv
+
+def main():
+    print("=" * 70)
+    print("Creating nobel_data_complete.json")
+    print("=" * 70)
+    print("Sources:")
+    print("  - Metadata: pipeline/data/01_raw_from_api.json")
+    print("  - Locations: laureates_data_to_fill_filledcoords_final.csv")
+    print("=" * 70)
+
+    # Backup existing JSON
+    backup_file = backup_json()
+
+    # Load CSV data
+    print("\nLoading CSV data...")
+    csv_data = load_csv_data('laureates_data_to_fill_filledcoords_final.csv')
+    print(f"✓ Loaded {len(csv_data)} laureates from CSV")
+
+    # Load API JSON
+    print("\nLoading API data...")
+    with open('pipeline/data/01_raw_from_api.json', 'r', encoding='utf-8') as f:
+        api_data = json.load(f)
+
+    # Count total laureates in API data
+    total_api = sum(len(laureates) for laureates in api_data.values())
+    print(f"✓ Loaded {total_api} laureates from API JSON")
+
+    # Update API data with CSV locations
+    print("\nMerging location data from CSV...")
+    updated_count, missing_in_csv, unused_csv = merge_csv_locations(api_data, csv_data)
+
+    # Add distance fields
+    print("\nComputing birth->work and co-laureate distances...")
+    with_distance = add_distance_fields(api_data)
+    print(f"✓ Distances for {with_distance} laureates with both birth and work coordinates")
+
+    # Validate coordinates against country boundaries (only if geodata/ has been downloaded)
+    consistency = check_consistency(api_data)
+    if consistency is None:
+        print("  ⚠ No geodata/countries.geojson - skipping reverse-geocode check")
+    else:
+        records, mismatches = consistency
+        if mismatches:
+            print_mismatches(mismatches)
+        else:
+            print(f"✓ All {len(records)} coordinates fall in the country named in their location")
+
     # Write updated JSON
     print("\nWriting nobel_data_complete.json...")
     with open('nobel_data_complete.json', 'w', encoding='utf-8') as f:
         json.dump(api_data, f, indent=2, ensure_ascii=False)
 
+    # Write the same data as typed columns for analytics (optional)
+    if HAVE_PYARROW:
+        print("Writing nobel_data_complete.parquet...")
+        write_parquet(api_data, 'nobel_data_complete.parquet')
+    else:
+        print("  ⚠ pyarrow not installed - skipping nobel_data_complete.parquet")
+
     print("\n" + "=" * 70)
     print("SUMMARY")
     print("=" * 70)
@@ -118,6 +191,8 @@ def main():
     print(f"Missing in CSV: {missing_in_csv}")
     print(f"Unused CSV entries: {unused_csv}")
     print(f"\n✓ Created: nobel_data_complete.json")
+    if HAVE_PYARROW:
+        print(f"✓ Created: nobel_data_complete.parquet")
     print("=" * 70)
 
 if __name__ == '__main__':
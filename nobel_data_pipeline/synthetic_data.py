@@ -0,0 +1,288 @@
+"""
+Synthetic datasets in the nobel_data_complete.json schema, of any size
+For load and scale testing: the real ~1000 laureates hide anything quadratic. The
+same seed and size always produce the same data. Distributions follow the real
+dataset:
+- categories in the real proportions, economics only from 1969
+- prizes shared by 1, 2 or 3 laureates (literature almost always alone), with
+  shared_with pointing at the other laureates of the same prize
+- locations reused with a heavy tail (a few hubs like Cambridge, MA hold many
+  laureates, most places one or two); birthplaces are more varied than workplaces
+- new places clustered around real cities, so coordinates form dense regions
+- about 27% of laureates flagged needs_enrichment, a few without birth coordinates
+
+    python synthetic_data.py COUNT OUTPUT [OUTPUT ...] [--seed 0]
+
+The format follows each OUTPUT's extension: .json (category -> laureates, like
+nobel_data_complete.json), .jsonl (one laureate per line with its category) or
+.csv (the step 2/step 4 CSV columns).
+"""
+import csv
+import json
+import os
+import random
+import sys
+
+# Real proportions (laureates per category in nobel_data_complete.json)
+CATEGORY_WEIGHTS = {
+    'physics': 230, 'chemistry': 200, 'medicine': 232,
+    'literature': 122, 'peace': 143, 'economics': 99,
+}
+FIRST_YEAR = {'economics': 1969}
+LAST_YEAR = 2025
+
+# Laureates per prize: weights for 1, 2 and 3
+SHARE_WEIGHTS = [57, 24, 19]
+SHARE_WEIGHTS_BY_CATEGORY = {'literature': [96, 4, 0], 'peace': [80, 15, 5]}
+
+# Chance that a laureate gets a place not used before. Otherwise an existing one:
+# mostly in proportion to how often it's used already (rich get richer), with
+# REUSE_UNIFORM of the picks uniform, which keeps the top places from running away
+NEW_PLACE_RATE = {'work': 0.3, 'birth': 0.67}
+REUSE_UNIFORM = 0.15
+
+# Starting popularity of the first hub (the last starts at 1)
+HUB_USES = 6
+
+# Degrees of jitter around the hub city a new place is generated near
+CLUSTER_SPREAD = 2.0
+
+NEEDS_ENRICHMENT_RATE = 0.27
+MISSING_BIRTH_RATE = 0.005
+
+HUBS = [
+    ('Cambridge, MA, USA', 42.3736, -71.1097), ('New York, NY, USA', 40.7128, -74.0060),
+    ('Paris, France', 48.8566, 2.3522), ('Cambridge, United Kingdom', 52.2053, 0.1218),
+    ('London, United Kingdom', 51.5074, -0.1278), ('Stanford, CA, USA', 37.4275, -122.1697),
+    ('Berkeley, CA, USA', 37.8715, -122.2730), ('Chicago, IL, USA', 41.8781, -87.6298),
+    ('Berlin, Germany', 52.5200, 13.4050), ('Stockholm, Sweden', 59.3293, 18.0686),
+    ('Pasadena, CA, USA', 34.1478, -118.1445), ('Princeton, NJ, USA', 40.3573, -74.6672),
+    ('Munich, Germany', 48.1351, 11.5820), ('Copenhagen, Denmark', 55.6761, 12.5683),
+    ('Zurich, Switzerland', 47.3769, 8.5417), ('Vienna, Austria', 48.2082, 16.3738),
+    ('Tokyo, Japan', 35.6762, 139.6503), ('Moscow, Russia', 55.7558, 37.6173),
+    ('Rome, Italy', 41.9028, 12.4964), ('Geneva, Switzerland', 46.2044, 6.1432),
+    ('Oxford, United Kingdom', 51.7520, -1.2577), ('Boston, MA, USA', 42.3601, -71.0589),
+    ('Toronto, Canada', 43.6532, -79.3832), ('Buenos Aires, Argentina', -34.6037, -58.3816),
+    ('Cape Town, South Africa', -33.9249, 18.4241), ('Cairo, Egypt', 30.0444, 31.2357),
+    ('New Delhi, India', 28.6139, 77.2090), ('Beijing, China', 39.9042, 116.4074),
+    ('Sydney, Australia', -33.8688, 151.2093), ('Mexico City, Mexico', 19.4326, -99.1332),
+]
+
+FIRST_NAMES = ['Anna', 'Carl', 'Marie', 'Hans', 'Emil', 'Lise', 'Otto', 'Irene', 'Niels', 'Ada',
+               'Karl', 'Rosa', 'Ivan', 'Maria', 'Paul', 'Elena', 'Yuki', 'Ahmed', 'Wangari', 'Chen',
+               'Jorge', 'Nadine', 'Amartya', 'Svetlana', 'Kofi', 'Toni', 'Rita', 'Ernest', 'Olga', 'Luis']
+LAST_NAMES = ['Berg', 'Curie', 'Fischer', 'Bohr', 'Meitner', 'Hahn', 'Lorentz', 'Sato', 'Zewail',
+              'Maathai', 'Yang', 'Borges', 'Gordimer', 'Sen', 'Alexievich', 'Annan', 'Morrison',
+              'Levi-Montalcini', 'Rutherford', 'Tokarczuk', 'Pauling', 'Dirac', 'Ostrom', 'Neruda',
+              'Kandel', 'Hodgkin', 'Salam', 'Tagore', 'Raman', 'Yunus']
+ACHIEVEMENT_STARTS = ['for the discovery of', 'for their work on', 'for pioneering contributions to',
+                      'for the development of', 'for investigations of', 'for outstanding work on']
+ACHIEVEMENT_TOPICS = ['the structure of the atomic nucleus', 'catalytic reactions in solution',
+                      'the mechanisms of cellular signalling', 'the theory of economic growth',
+                      'a body of lyrical prose', 'efforts towards lasting peace',
+                      'the properties of superconducting materials', 'methods of protein analysis',
+                      'the genetic control of development', 'the analysis of market behaviour']
+
+CSV_FIELDS = ['laureate_id', 'name', 'category', 'year', 'birth_location', 'birth_lat', 'birth_lon',
+              'work_location', 'work_lat', 'work_lon', 'notes']
+
+
+class _Places:
+    """Place picker: new places near a hub city, reused ones mostly by popularity"""
+
+    def __init__(self, rng, new_rate, prefix):
+        self.rng = rng
+        self.new_rate = new_rate
+        self.prefix = prefix
+        # The hubs start out in use (the first ones most), so no single early place
+        # runs away with the counts
+        self.places = list(HUBS)
+        self.uses = [i for i in range(len(HUBS)) for _ in range(HUB_USES - i * HUB_USES // len(HUBS))]
+
+    def pick(self):
+        if self.rng.random() < self.new_rate:
+            index = len(self.places)
+            self.places.append(self._new_place())
+        elif self.rng.random() < REUSE_UNIFORM:
+            index = self.rng.randrange(len(self.places))
+        else:
+            index = self.rng.choice(self.uses)
+        self.uses.append(index)
+        return self.places[index]
+
+    def _new_place(self):
+        name, lat, lon = self.rng.choice(HUBS)
+        country = name.rsplit(', ', 1)[1]
+        return (f'{self.prefix} {len(self.places) + 1}, {country}',
+                round(max(-89.9, min(89.9, lat + self.rng.gauss(0, CLUSTER_SPREAD))), 6),
+                round((lon + self.rng.gauss(0, CLUSTER_SPREAD) + 180) % 360 - 180, 6))
+
+
+def generate(count, seed=0):
+    """count laureates, {category: [laureate, ...]} like nobel_data_complete.json"""
+    rng = random.Random(seed)
+    places = {kind: _Places(rng, rate, 'Workplace' if kind == 'work' else 'Town')
+              for kind, rate in NEW_PLACE_RATE.items()}
+    categories = list(CATEGORY_WEIGHTS)
+    # Prizes are drawn, so weight each category by its laureates per prize
+    weights = []
+    for category in categories:
+        shares = SHARE_WEIGHTS_BY_CATEGORY.get(category, SHARE_WEIGHTS)
+        weights.append(CATEGORY_WEIGHTS[category] * sum(shares) / sum(n * w for n, w in zip([1, 2, 3], shares)))
+
+    data = {category: [] for category in categories}
+    next_id = 1
+    total = 0
+    while total < count:
+        category = rng.choices(categories, weights)[0]
+        year = rng.randint(FIRST_YEAR.get(category, 1901), LAST_YEAR)
+        size = rng.choices([1, 2, 3], SHARE_WEIGHTS_BY_CATEGORY.get(category, SHARE_WEIGHTS))[0]
+        size = min(size, count - total)
+        ids = [f'{category}_{year}_{next_id + i}' for i in range(size)]
+        next_id += size
+
+        for laureate_id in ids:
+            work, work_lat, work_lon = places['work'].pick()
+            if rng.random() < MISSING_BIRTH_RATE:
+                birth, birth_lat, birth_lon = '', 0, 0
+            else:
+                birth, birth_lat, birth_lon = places['birth'].pick()
+            needs_enrichment = rng.random() < NEEDS_ENRICHMENT_RATE
+            data[category].append({
+                'laureate_id': laureate_id,
+                'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                'birth_location': birth,
+                'birth_lat': birth_lat,
+                'birth_lon': birth_lon,
+                'work_location': work,
+                'work_lat': work_lat,
+                'work_lon': work_lon,
+                'work_years': f'{year - 5}-{year}',
+                'prize_year': year,
+                'achievement': f'{rng.choice(ACHIEVEMENT_STARTS)} {rng.choice(ACHIEVEMENT_TOPICS)}',
+                'shared_with': [other for other in ids if other != laureate_id],
+                'data_source': 'needs_enrichment' if needs_enrichment else 'api',
+                'needs_enrichment': needs_enrichment,
+                'enrichment_attempts': [],
+            })
+        total += size
+    return data
+
+
+# Category keys -> names in the Nobel Prize API
+API_CATEGORY_NAMES = {
+    'physics': 'Physics', 'chemistry': 'Chemistry', 'medicine': 'Physiology or Medicine',
+    'literature': 'Literature', 'peace': 'Peace', 'economics': 'Economic Sciences',
+}
+
+
+def _api_place(location, lat, lon):
+    city, _, country = location.rpartition(', ')
+    place = {'country': {'en': country}}
+    if city:
+        place['city'] = {'en': city}
+    if lat or lon:
+        place['cityNow'] = {'latitude': str(lat), 'longitude': str(lon)}
+    return place
+
+
+def api_laureates(data):
+    """
+    The same laureates as Nobel Prize API v2.1 records (what step 1 fetches and
+    process_laureates_by_category() reads), one record per prize
+    """
+    records = []
+    for category, laureates in data.items():
+        for laureate in laureates:
+            prize = {
+                'awardYear': str(laureate['prize_year']),
+                'category': {'en': API_CATEGORY_NAMES[category]},
+                'motivation': {'en': f'"{laureate["achievement"]}"'},
+                'affiliations': [],
+            }
+            if not laureate['needs_enrichment']:
+                prize['affiliations'].append(dict(
+                    _api_place(laureate['work_location'], laureate['work_lat'], laureate['work_lon']),
+                    name={'en': 'University'}))
+            record = {
+                'id': laureate['laureate_id'].rsplit('_', 1)[1],
+                'fullName': {'en': laureate['name']},
+                'nobelPrizes': [prize],
+            }
+            if laureate['birth_location']:
+                record['birth'] = {'place': _api_place(
+                    laureate['birth_location'], laureate['birth_lat'], laureate['birth_lon'])}
+            records.append(record)
+    return records
+
+
+def write_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def write_jsonl(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for category, laureates in data.items():
+            for laureate in laureates:
+                f.write(json.dumps(dict(laureate, category=category), ensure_ascii=False) + '\n')
+
+
+def write_csv(data, path):
+    """The step 2 / step 4 CSV layout; missing (0, 0) coordinates left blank"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for category, laureates in data.items():
+            for laureate in laureates:
+                writer.writerow({
+                    'laureate_id': laureate['laureate_id'],
+                    'name': laureate['name'],
+                    'category': category,
+                    'year': laureate['prize_year'],
+                    'birth_location': laureate['birth_location'],
+                    'birth_lat': laureate['birth_lat'] or '',
+                    'birth_lon': laureate['birth_lon'] or '',
+                    'work_location': laureate['work_location'],
+                    'work_lat': laureate['work_lat'] or '',
+                    'work_lon': laureate['work_lon'] or '',
+                    'notes': '',
+                })
+
+
+WRITERS = {'.json': write_json, '.jsonl': write_jsonl, '.csv': write_csv}
+
+
+def write(data, path):
+    """Write in the format matching path's extension"""
+    extension = os.path.splitext(path)[1]
+    if extension not in WRITERS:
+        raise ValueError(f"Unknown format {extension!r}; use one of: {', '.join(WRITERS)}")
+    WRITERS[extension](data, path)
+
+
+def main():
+    args = sys.argv[1:]
+    seed = 0
+    if '--seed' in args:
+        i = args.index('--seed')
+        seed = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) < 2:
+        print(__doc__)
+        return
+
+    count, outputs = int(args[0]), args[1:]
+    data = generate(count, seed)
+    for path in outputs:
+        write(data, path)
+        print(f"✓ Wrote {count:,} laureates to {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+    laureates = [laureate for category_laureates in data.values() for laureate in category_laureates]
+    print(f"  {len({l['work_location'] for l in laureates}):,} work places, "
+          f"{len({l['birth_location'] for l in laureates}):,} birthplaces, "
+          f"{sum(1 for l in laureates if l['shared_with']):,} shared prizes' laureates (seed {seed})")
+
+
+if __name__ == '__main__':
+    main()
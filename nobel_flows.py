@@ -0,0 +1,90 @@
+"""
+Nobel Prize migration flows module
+Aggregates birth -> work moves into weighted flows between countries or cities,
+precomputed per category once per data load
+"""
+
+from collections import Counter, defaultdict
+from statistics import median
+
+from geo import haversine_km, has_coords
+from nobel_data import get_derived
+
+LEVELS = ['country', 'city']
+
+
+def _place_key(location, level):
+    """Key a location string at the given level ("Cambridge, MA, USA" -> "USA" for country)"""
+    if level == 'country':
+        return location.rsplit(',', 1)[-1].strip()
+    return location.strip()
+
+
+def _aggregate(laureates_with_category, level):
+    """Bin (category, laureate) pairs into flows at one level"""
+    flows = defaultdict(lambda: {'distances': [], 'categories': Counter()})
+    # Place coordinates: mean of the laureate coordinates seen for that place
+    coord_sums = defaultdict(lambda: [0.0, 0.0, 0])
+
+    for category, laureate in laureates_with_category:
+        birth = laureate.get('birth_location', '')
+        work = laureate.get('work_location', '')
+        if not birth or not work:
+            continue
+        if not has_coords(laureate['birth_lat'], laureate['birth_lon']) or \
+           not has_coords(laureate['work_lat'], laureate['work_lon']):
+            continue
+
+        origin = _place_key(birth, level)
+        destination = _place_key(work, level)
+        for key, lat, lon in ((origin, laureate['birth_lat'], laureate['birth_lon']),
+                              (destination, laureate['work_lat'], laureate['work_lon'])):
+            sums = coord_sums[key]
+            sums[0] += lat
+            sums[1] += lon
+            sums[2] += 1
+
+        if origin == destination:
+            continue
+
+        flow = flows[(origin, destination)]
+        distance = laureate.get('birth_work_distance_km')
+        if distance is None:
+            distance = haversine_km(laureate['birth_lat'], laureate['birth_lon'],
+                                    laureate['work_lat'], laureate['work_lon'])
+        flow['distances'].append(distance)
+        flow['categories'][category] += 1
+
+    def place(key):
+        lat_sum, lon_sum, n = coord_sums[key]
+        return {'name': key, 'lat': round(lat_sum / n, 6), 'lon': round(lon_sum / n, 6)}
+
+    result = []
+    for (origin, destination), flow in flows.items():
+        result.append({
+            'from': place(origin),
+            'to': place(destination),
+            'count': len(flow['distances']),
+            'median_km': round(median(flow['distances']), 1),
+            'categories': dict(flow['categories']),
+        })
+    result.sort(key=lambda f: (-f['count'], f['from']['name'], f['to']['name']))
+    return result
+
+
+def compute_flows(all_data):
+    """Flows for every level, for each category and for 'all'"""
+    pairs = [(category, laureate) for category, laureates in all_data.items() for laureate in laureates]
+
+    flows = {}
+    for level in LEVELS:
+        flows[level] = {'all': _aggregate(pairs, level)}
+        for category in all_data:
+            flows[level][category] = _aggregate([p for p in pairs if p[0] == category], level)
+    return flows
+
+
+def get_flows(level='country', category='all'):
+    """Get precomputed flows, or None for an unknown level/category"""
+    flows = get_derived('flows', compute_flows)
+    return flows.get(level, {}).get(category)
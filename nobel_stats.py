@@ -0,0 +1,99 @@
+"""
+Nobel Prize statistics module
+Group-by aggregates over the laureate data, computed once per data load
+"""
+
+from collections import Counter, defaultdict
+
+from geo import has_coords
+from nobel_data import get_derived
+
+
+def _country(location):
+    """Last comma-separated part of a location string ("Cambridge, MA, USA" -> "USA")"""
+    return location.rsplit(',', 1)[-1].strip() if location else ''
+
+
+def _ranked(counter, places=None):
+    """Counter -> list of {name, count} sorted by count (ties by name)"""
+    rows = []
+    for name, count in sorted(counter.items(), key=lambda item: (-item[1], item[0])):
+        row = {'name': name, 'count': count}
+        if places is not None and name in places:
+            row['lat'], row['lon'] = places[name]
+        rows.append(row)
+    return rows
+
+
+def compute_stats(all_data):
+    """Compute every aggregate in a single pass over the data"""
+    work_cities = Counter()
+    work_countries = Counter()
+    birth_countries = Counter()
+    work_city_coords = {}
+    category_decade = defaultdict(Counter)
+    prizes = defaultdict(set)  # (category, year) -> laureate ids
+    laureates_shared = Counter()
+    laureates_solo = Counter()
+
+    for category, laureates in all_data.items():
+        for laureate in laureates:
+            work_location = laureate.get('work_location', '')
+            if work_location:
+                work_cities[work_location] += 1
+                work_countries[_country(work_location)] += 1
+                coords = (laureate.get('work_lat', 0), laureate.get('work_lon', 0))
+                if work_location not in work_city_coords and has_coords(*coords):
+                    work_city_coords[work_location] = coords
+
+            birth_country = _country(laureate.get('birth_location', ''))
+            if birth_country:
+                birth_countries[birth_country] += 1
+
+            year = laureate['prize_year']
+            category_decade[category][year // 10 * 10] += 1
+            prizes[(category, year)].add(laureate['laureate_id'])
+
+            if laureate.get('shared_with'):
+                laureates_shared[category] += 1
+            else:
+                laureates_solo[category] += 1
+
+    shared_vs_solo = {}
+    for category in all_data:
+        sizes = [len(ids) for (cat, _), ids in prizes.items() if cat == category]
+        shared_vs_solo[category] = {
+            'prizes': len(sizes),
+            'solo_prizes': sum(1 for n in sizes if n == 1),
+            'shared_prizes': sum(1 for n in sizes if n > 1),
+            'solo_laureates': laureates_solo[category],
+            'shared_laureates': laureates_shared[category],
+        }
+
+    return {
+        'work_cities': _ranked(work_cities, work_city_coords),
+        'work_countries': _ranked(work_countries),
+        'birth_countries': _ranked(birth_countries),
+        'category_decades': {
+            category: [{'decade': decade, 'count': count} for decade, count in sorted(decades.items())]
+            for category, decades in category_decade.items()
+        },
+        'shared_vs_solo': shared_vs_solo,
+        'total_laureates': sum(len(laureates) for laureates in all_data.values()),
+    }
+
+
+def get_stats():
+    """Get all statistics (cached per data load)"""
+    return get_derived('stats', compute_stats)
+
+
+# Names served under /api/stats/<name>
+STAT_NAMES = ['work_cities', 'work_countries', 'birth_countries', 'category_decades', 'shared_vs_solo']
+
+
+def get_stat(name):
+    """Get a single statistic by name, or None if there is no such statistic"""
+    if name not in STAT_NAMES:
+        return None
+    return get_stats()[name]
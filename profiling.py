@@ -0,0 +1,229 @@
+"""
+On-demand request profiling
+Profiles selected requests, from the first call into the app until the last byte
+of the body has been sent (so streamed pages are covered), and writes one file per
+request to NOBEL_PROFILE_DIR (default profiles/):
+
+- pstats (cProfile, deterministic): python -m pstats FILE, or snakeviz FILE
+- collapsed stacks (sampling, much lower overhead): flamegraph.pl FILE > out.svg,
+  or open in speedscope
+
+A request is profiled when either
+- NOBEL_PROFILE=1 and its route is in NOBEL_PROFILE_ROUTES (comma-separated URL
+  rules, default /table), or
+- it carries a signed ?profile=<token> for its path, made with
+  `flask --app app profile-url /table` (valid for an hour; only honoured when
+  SECRET_KEY is set, since the development default key is public)
+
+Each route is profiled at most once per NOBEL_PROFILE_INTERVAL seconds (default 60)
+and one request at a time per process; other requests run unprofiled. The mode is
+NOBEL_PROFILE_MODE (sample or cprofile, default sample), or ?profile_mode= on a
+signed URL. Profiled responses name their file in an X-Profile header.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs, urlencode
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from werkzeug.exceptions import HTTPException
+
+MODES = ['sample', 'cprofile']
+EXTENSIONS = {'sample': 'collapsed', 'cprofile': 'pstats'}
+
+# Seconds between stack samples in sample mode
+SAMPLE_INTERVAL = 0.002
+
+# How long a signed profile URL stays valid
+TOKEN_MAX_AGE = 3600
+
+
+class Sampler:
+    """Samples one thread's stack every `interval` seconds from a background thread"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def _run(self):
+        own_frame = sys._getframe()
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not own_frame:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def enable(self):
+        self.thread.start()
+
+    def disable(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def dump_stats(self, path):
+        """Collapsed stacks: one `frame;frame;... count` line per distinct stack"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class _Body:
+    """Response iterable that stops the profiler and writes its file when the server closes it"""
+
+    def __init__(self, iterable, finish):
+        self.iterable = iterable
+        self.finish = finish
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+    def close(self):
+        try:
+            if hasattr(self.iterable, 'close'):
+                self.iterable.close()
+        finally:
+            self.finish()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self.config = app.config
+        self.serializer = _serializer(app)
+        self.busy = threading.Lock()
+        self.rate_lock = threading.Lock()
+        self.last_profiled = {}  # route -> time.monotonic() of its last profile
+
+    def _route(self, environ):
+        try:
+            rule, _ = self.app.url_map.bind_to_environ(environ).match(return_rule=True)
+        except HTTPException:
+            return None
+        return rule.rule
+
+    def _mode(self, environ):
+        """Profiling mode for this request, or None to run it unprofiled"""
+        query = environ.get('QUERY_STRING', '')
+        signed = self.serializer is not None and 'profile=' in query
+        if not signed and not self.config['PROFILE']:
+            return None
+
+        route = self._route(environ)
+        if route is None:
+            return None
+        mode = self.config['PROFILE_MODE']
+        if signed:
+            args = parse_qs(query)
+            try:
+                path = self.serializer.loads(args.get('profile', [''])[0], max_age=TOKEN_MAX_AGE)
+            except BadSignature:
+                return None
+            if path != environ.get('PATH_INFO'):
+                return None
+            mode = args.get('profile_mode', [mode])[0]
+            if mode not in MODES:
+                return None
+        elif route not in self.config['PROFILE_ROUTES']:
+            return None
+        return route, mode
+
+    def _claim(self, route):
+        """Take the profiler for `route` if its interval has passed and nothing else is being profiled"""
+        if not self.busy.acquire(blocking=False):
+            return False
+        with self.rate_lock:
+            now = time.monotonic()
+            if now - self.last_profiled.get(route, float('-inf')) >= self.config['PROFILE_INTERVAL']:
+                self.last_profiled[route] = now
+                return True
+        self.busy.release()
+        return False
+
+    def __call__(self, environ, start_response):
+        selected = self._mode(environ)
+        if selected is None or not self._claim(selected[0]):
+            return self.wsgi_app(environ, start_response)
+
+        route, mode = selected
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', route).strip('-') or 'index'
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{os.getpid()}.{EXTENSIONS[mode]}"
+        path = os.path.join(self.config['PROFILE_DIR'], name)
+        if mode == 'sample':
+            profiler = Sampler(threading.get_ident())
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+
+        def add_header(status, headers, exc_info=None):
+            return start_response(status, headers + [('X-Profile', name)], exc_info)
+
+        def finish():
+            try:
+                profiler.disable()
+                os.makedirs(self.config['PROFILE_DIR'], exist_ok=True)
+                profiler.dump_stats(path)
+                print(f"✓ Profiled {environ.get('PATH_INFO')} ({mode}) -> {path}")
+            finally:
+                self.busy.release()
+
+        profiler.enable()
+        try:
+            return _Body(self.wsgi_app(environ, add_header), finish)
+        except BaseException:
+            finish()
+            raise
+
+
+def _serializer(app):
+    """Signs profile tokens with the app's secret key, or None if SECRET_KEY isn't set"""
+    if not os.environ.get('SECRET_KEY'):
+        return None
+    return URLSafeTimedSerializer(app.secret_key, salt='nobel-profile')
+
+
+def init_app(app):
+    """Install the profiling middleware (inactive until NOBEL_PROFILE=1 or a signed ?profile= URL)"""
+    app.config.setdefault('PROFILE', os.environ.get('NOBEL_PROFILE', '0') == '1')
+    app.config.setdefault('PROFILE_ROUTES', [route.strip() for route in
+                                             os.environ.get('NOBEL_PROFILE_ROUTES', '/table').split(',')])
+    app.config.setdefault('PROFILE_MODE', os.environ.get('NOBEL_PROFILE_MODE', 'sample'))
+    app.config.setdefault('PROFILE_INTERVAL', float(os.environ.get('NOBEL_PROFILE_INTERVAL', 60)))
+    app.config.setdefault('PROFILE_DIR', os.environ.get(
+        'NOBEL_PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')))
+    if app.config['PROFILE_MODE'] not in MODES:
+        raise ValueError(f"NOBEL_PROFILE_MODE must be one of: {', '.join(MODES)}")
+
+    app.wsgi_app = ProfilingMiddleware(app)
+    app.cli.add_command(profile_url_command)
+
+
+@click.command('profile-url')
+@click.argument('path')
+@click.option('--mode', type=click.Choice(MODES), default=None, help='Profiler (default: NOBEL_PROFILE_MODE)')
+@with_appcontext
+def profile_url_command(path, mode):
+    """Print PATH with a signed ?profile= token that profiles one request to it"""
+    serializer = _serializer(current_app)
+    if serializer is None:
+        raise click.UsageError('Set SECRET_KEY (the same one the server uses) to sign profile URLs')
+    args = {'profile': serializer.dumps(path.partition('?')[0])}
+    if mode:
+        args['profile_mode'] = mode
+    separator = '&' if '?' in path else '?'
+    print(f"{path}{separator}{urlencode(args)}")
+    print(f"  valid for {TOKEN_MAX_AGE // 60} minutes; one profile per route every "
+          f"{current_app.config['PROFILE_INTERVAL']:g}s")
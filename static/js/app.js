@@ -30,12 +30,88 @@ const CATEGORY_NAMES = {
     'economics': 'Economic Sciences'
 };
 
-// Add OpenStreetMap tiles
-L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+// Add OpenStreetMap tiles (through the server's caching proxy if it set one)
+const tileUrl = document.getElementById('map').dataset.tileUrl || 'https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png';
+L.tileLayer(tileUrl, {
     attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
     maxZoom: 18
 }).addTo(map);
 
+// In a frozen (static) export, API responses live in content-hashed files listed in
+// the manifest the page carries; everywhere else the URL is used as-is
+const API_MANIFEST = (() => {
+    const element = document.getElementById('api-manifest');
+    return element ? JSON.parse(element.textContent) : null;
+})();
+
+function apiUrl(url) {
+    if (!API_MANIFEST) {
+        return url;
+    }
+    if (API_MANIFEST.files[url]) {
+        return `/${API_MANIFEST.files[url]}`;
+    }
+    for (const [prefix, directory] of Object.entries(API_MANIFEST.prefixes)) {
+        if (url.startsWith(prefix)) {
+            return `/${directory}${url.slice(prefix.length)}.json`;
+        }
+    }
+    return url;
+}
+
+// Fetch the map's fields only, as parallel arrays, and turn them back into laureate objects.
+// Heavy fields (achievement) are loaded per laureate by loadLaureateDetails when shown.
+async function fetchLaureates(category) {
+    const response = await fetch(apiUrl(`/api/laureates/${category}?fields=map&format=columnar`));
+    const data = await response.json();
+    if (data.error) {
+        return data;
+    }
+    return fromColumnar(data);
+}
+
+// The same payload for the default view, if the server inlined it into the page
+function readBootstrapData() {
+    const element = document.getElementById('bootstrap-data');
+    return element ? fromColumnar(JSON.parse(element.textContent)) : null;
+}
+
+function fromColumnar(data) {
+    const laureates = [];
+    for (let i = 0; i < data.count; i++) {
+        const laureate = {};
+        data.fields.forEach(field => {
+            const value = data.columns[field][i];
+            laureate[field] = field in data.dictionaries ? data.dictionaries[field][value] : value;
+        });
+        laureates.push(laureate);
+    }
+    return { category: data.category, laureates: laureates };
+}
+
+// Load the fields left out of the map payload and fill them into the card/popup
+async function loadLaureateDetails(laureate) {
+    if (laureate.achievement === undefined) {
+        try {
+            const response = await fetch(apiUrl(`/api/laureate/${encodeURIComponent(laureate.laureate_id)}`));
+            if (!response.ok) {
+                return;
+            }
+            Object.assign(laureate, await response.json());
+        } catch (error) {
+            console.error('Error fetching laureate details:', error);
+            return;
+        }
+    }
+    document.querySelectorAll(`[data-achievement-for="${laureate.laureate_id}"]`).forEach(element => {
+        element.textContent = laureate.achievement;
+    });
+}
+
+function achievementText(laureate) {
+    return laureate.achievement === undefined ? '' : laureate.achievement;
+}
+
 // Helper function to generate Wikipedia URL from laureate name
 function getWikipediaUrl(name) {
     // Replace spaces with underscores and encode special characters
@@ -184,8 +260,7 @@ categorySelect.addEventListener('change', async (e) => {
     updateDropdownColor(category);
 
     try {
-        const response = await fetch(`/api/laureates/${category}`);
-        const data = await response.json();
+        const data = await fetchLaureates(category);
 
         if (data.error) {
             alert(data.error);
@@ -518,7 +593,7 @@ function createLaureateCard(laureate, index) {
         </div>
         ${categoryBadge}
         <div class="laureate-year">Nobel Prize ${laureate.prize_year}</div>
-        <div class="laureate-achievement">${laureate.achievement}</div>
+        <div class="laureate-achievement" data-achievement-for="${laureate.laureate_id}">${achievementText(laureate)}</div>
         <div class="laureate-locations">
             <div class="location-item">
                 <span class="location-icon">🎂</span>
@@ -633,7 +708,7 @@ function createGroupPopupContent(group, selectedIndex) {
                 <div class="popup-label">Work Years:</div>
                 <div class="popup-value">${laureate.work_years}</div>
             </div>
-            <div class="popup-achievement">${laureate.achievement}</div>
+            <div class="popup-achievement" data-achievement-for="${laureate.laureate_id}">${achievementText(laureate)}</div>
             ${coLaureateLinks ? `<div class="popup-shared">Shared with: ${coLaureateLinks}</div>` : ''}
         `;
     } else {
@@ -726,7 +801,7 @@ function createPopupContent(laureate, type) {
         </div>
         <div class="popup-year">Nobel Prize ${laureate.prize_year}</div>
         ${locationInfo}
-        <div class="popup-achievement">${laureate.achievement}</div>
+        <div class="popup-achievement" data-achievement-for="${laureate.laureate_id}">${achievementText(laureate)}</div>
         ${coLaureateLinks ? `<div class="popup-shared">Shared with: ${coLaureateLinks}</div>` : ''}
     `;
 
@@ -758,6 +833,11 @@ function highlightLaureate(index, keepPopupOpen = false) {
     // Store the currently selected laureate index
     currentSelectedLaureateIndex = index;
 
+    // Fetch the achievement text etc. (filled into the card and popup when it arrives)
+    if (currentLaureates[index]) {
+        loadLaureateDetails(currentLaureates[index]);
+    }
+
     // Remove active class from all cards
     document.querySelectorAll('.laureate-card').forEach(card => {
         card.classList.remove('active');
@@ -844,8 +924,8 @@ window.addEventListener('DOMContentLoaded', async () => {
         updateDropdownColor(category);
 
         try {
-            const response = await fetch(`/api/laureates/${category}`);
-            const data = await response.json();
+            const bootstrapData = category === 'all' ? readBootstrapData() : null;
+            const data = bootstrapData || await fetchLaureates(category);
 
             if (data.error) {
                 console.error('Error loading default category:', data.error);
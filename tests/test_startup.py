@@ -0,0 +1,51 @@
+"""
+Startup budget: runs benchmarks/startup.py in a subprocess and checks the import
+time (-X importtime), time-to-ready and the modules that must stay lazy.
+Slow CI runners can raise the budgets with NOBEL_IMPORT_BUDGET_MS / NOBEL_READY_BUDGET_MS.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'benchmarks', 'startup.py')
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import startup
+
+IMPORT_BUDGET_MS = float(os.environ.get('NOBEL_IMPORT_BUDGET_MS', startup.IMPORT_BUDGET_MS))
+READY_BUDGET_MS = float(os.environ.get('NOBEL_READY_BUDGET_MS', startup.READY_BUDGET_MS))
+
+
+@pytest.fixture(scope='module')
+def results():
+    process = subprocess.run(
+        [sys.executable, SCRIPT, '--runs', '3', '--json',
+         '--import-budget-ms', str(IMPORT_BUDGET_MS), '--ready-budget-ms', str(READY_BUDGET_MS)],
+        cwd=ROOT, capture_output=True, text=True, timeout=300)
+    assert process.returncode in (0, 1), process.stderr
+    return json.loads(process.stdout)
+
+
+def test_importtime_is_captured(results):
+    modules = results['modules']
+    assert modules['app'] > 0
+    assert {'flask', 'nobel_api', 'nobel_data'} <= set(modules)
+
+
+def test_import_within_budget(results):
+    assert results['phases']['import_ms'] <= IMPORT_BUDGET_MS, results['failures']
+
+
+def test_ready_within_budget(results):
+    assert results['phases']['ready_ms'] <= READY_BUDGET_MS, results['failures']
+
+
+def test_lazy_modules_not_imported_at_startup(results):
+    assert results['eager_modules'] == []
+
+
+def test_no_budget_failures(results):
+    assert results['failures'] == []
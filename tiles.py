@@ -0,0 +1,261 @@
+"""
+Caching proxy for the base map tiles
+Serves /basemap/<z>/<x>/<y>.png from a bounded on-disk LRU cache, fetching misses
+from a configurable upstream. Concurrent requests for the same missing tile share
+one upstream fetch. Enabled with NOBEL_TILE_PROXY=1; app.js then loads tiles from
+here instead of straight from OpenStreetMap.
+
+- NOBEL_TILE_UPSTREAM   tile URL template (default OpenStreetMap), or "stub" for
+                        locally generated placeholder tiles (offline development, tests)
+- NOBEL_TILE_CACHE_DIR  cache directory (default tile_cache/ next to this file)
+- NOBEL_TILE_CACHE_MB   cache size limit in MB (default 200) for the whole server
+
+Each process keeps its own LRU index of the shared directory, so with several
+workers each one evicts down to its share of NOBEL_TILE_CACHE_MB and the directory
+as a whole stays within the limit. gunicorn.conf.py sets the share from its worker
+count; otherwise it comes from WEB_CONCURRENCY (default 1).
+
+    flask --app app prewarm-tiles --max-zoom 4 (needs NOBEL_TILE_UPSTREAM other than OpenStreetMap)
+"""
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import click
+from flask import Blueprint, Response, abort, current_app
+from flask.cli import with_appcontext
+
+OSM_UPSTREAM = 'https://tile.openstreetmap.org/{z}/{x}/{y}.png'
+USER_AGENT = 'NobelPrizeMap/1.0 (Educational Project)'
+MAX_ZOOM = 19
+
+# How long browsers may keep a tile
+BROWSER_MAX_AGE = 7 * 24 * 3600
+
+bp = Blueprint('tiles', __name__)
+
+
+class TileCache:
+    """Tiles as files under cache_dir/z/x/y.png; least recently used files are deleted past max_bytes"""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # (z, x, y) -> size, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        # Pick up what a previous run left, oldest access first
+        found = []
+        for root, _, names in os.walk(cache_dir):
+            for name in names:
+                if not name.endswith('.png'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    z, x = (int(part) for part in os.path.relpath(root, cache_dir).split(os.sep))
+                    key = (z, x, int(name[:-4]))
+                except ValueError:
+                    continue
+                stat = os.stat(path)
+                found.append((stat.st_atime, key, stat.st_size))
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total_bytes += size
+
+    def path(self, key):
+        z, x, y = key
+        return os.path.join(self.cache_dir, str(z), str(x), f'{y}.png')
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        try:
+            with open(self.path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            with self.lock:
+                self.total_bytes -= self.entries.pop(key, 0)
+            return None
+
+    def put(self, key, body):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp, 'wb') as f:
+            f.write(body)
+        os.replace(temp, path)
+
+        with self.lock:
+            self.total_bytes += len(body) - self.entries.pop(key, 0)
+            self.entries[key] = len(body)
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_key, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                try:
+                    os.remove(self.path(old_key))
+                except OSError:
+                    pass
+
+
+class TileProxy:
+    """Cache in front of an upstream fetch; concurrent misses for one tile wait for a single fetch"""
+
+    def __init__(self, cache, fetch):
+        self.cache = cache
+        self.fetch = fetch
+        self.lock = threading.Lock()
+        self.in_flight = {}  # key -> (Event, [body])
+        self.upstream_fetches = 0
+
+    def get(self, z, x, y):
+        key = (z, x, y)
+        body = self.cache.get(key)
+        if body is not None:
+            return body
+
+        with self.lock:
+            waiting = self.in_flight.get(key)
+            if waiting is None:
+                waiting = self.in_flight[key] = (threading.Event(), [None])
+                self.upstream_fetches += 1
+                leader = True
+            else:
+                leader = False
+
+        event, result = waiting
+        if not leader:
+            event.wait()
+            return result[0]
+
+        try:
+            result[0] = self.fetch(z, x, y)
+            if result[0] is not None:
+                self.cache.put(key, result[0])
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            event.set()
+        return result[0]
+
+
+def fetch_upstream(template):
+    """fetch(z, x, y) -> PNG bytes or None, from a {z}/{x}/{y} URL template"""
+    import requests
+
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+
+    def fetch(z, x, y):
+        try:
+            response = session.get(template.format(z=z, x=x, y=y), timeout=10)
+            response.raise_for_status()
+            return response.content
+        except Exception as e:
+            print(f"  ⚠ Tile {z}/{x}/{y} failed: {e}")
+            return None
+    return fetch
+
+
+def stub_tile(z, x, y):
+    """A flat 256x256 PNG, shaded by zoom level, in place of a real tile"""
+    shade = 200 + (z * 5) % 50
+    row = b'\x00' + bytes((shade, shade, 255 - z * 4)) * 256
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', 256, 256, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(row * 256, 9))
+            + chunk(b'IEND', b''))
+
+
+def create_proxy(upstream, cache_dir, max_bytes):
+    fetch = stub_tile if upstream == 'stub' else fetch_upstream(upstream)
+    return TileProxy(TileCache(cache_dir, max_bytes), fetch)
+
+
+@bp.route('/basemap/<int:z>/<int:x>/<int:y>.png')
+def basemap_tile(z, x, y):
+    """One base map tile, from the local cache when possible"""
+    if z > MAX_ZOOM or x >= 2 ** z or y >= 2 ** z:
+        abort(404)
+    body = current_app.extensions['tile_proxy'].get(z, x, y)
+    if body is None:
+        abort(502)
+    response = Response(body, mimetype='image/png')
+    response.cache_control.public = True
+    response.cache_control.max_age = BROWSER_MAX_AGE
+    return response
+
+
+def init_app(app):
+    """Register /basemap/... if NOBEL_TILE_PROXY=1, and the prewarm-tiles command"""
+    app.config.setdefault('TILE_PROXY', os.environ.get('NOBEL_TILE_PROXY', '0') == '1')
+    app.config.setdefault('TILE_UPSTREAM', os.environ.get('NOBEL_TILE_UPSTREAM', OSM_UPSTREAM))
+    app.config.setdefault('TILE_CACHE_DIR', os.environ.get(
+        'NOBEL_TILE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tile_cache')))
+    app.config.setdefault('TILE_CACHE_MB', int(os.environ.get('NOBEL_TILE_CACHE_MB', 200)))
+    # Processes sharing the cache directory, each with its own LRU index
+    app.config.setdefault('TILE_CACHE_PROCESSES', max(int(os.environ.get('WEB_CONCURRENCY', 1)), 1))
+    app.cli.add_command(prewarm_tiles_command)
+
+    if app.config['TILE_PROXY']:
+        max_bytes = app.config['TILE_CACHE_MB'] * 1024 * 1024 // app.config['TILE_CACHE_PROCESSES']
+        app.extensions['tile_proxy'] = create_proxy(app.config['TILE_UPSTREAM'], app.config['TILE_CACHE_DIR'], max_bytes)
+        app.register_blueprint(bp)
+
+
+def share_cache(app, processes):
+    """Limit this process's tile cache to its share of TILE_CACHE_MB, with `processes` sharing the directory"""
+    app.config['TILE_CACHE_PROCESSES'] = max(processes, 1)
+    proxy = app.extensions.get('tile_proxy')
+    if proxy is not None:
+        proxy.cache.max_bytes = app.config['TILE_CACHE_MB'] * 1024 * 1024 // app.config['TILE_CACHE_PROCESSES']
+
+
+def tile_url_template(app):
+    """Tile URL for Leaflet if the proxy is enabled, else None (app.js then uses OpenStreetMap directly)"""
+    if app.config['TILE_PROXY']:
+        return '/basemap/{z}/{x}/{y}.png'
+    return None
+
+
+@click.command('prewarm-tiles')
+@click.option('--max-zoom', default=4, show_default=True, help='Fetch every tile from zoom 0 up to this level')
+@click.option('--delay', default=0.1, show_default=True, help='Seconds between upstream fetches')
+@with_appcontext
+def prewarm_tiles_command(max_zoom, delay):
+    """Fill the tile cache with every tile up to --max-zoom (not from OpenStreetMap itself)"""
+    config = current_app.config
+    if config['TILE_UPSTREAM'] == OSM_UPSTREAM:
+        raise click.UsageError("OpenStreetMap's tile usage policy forbids bulk downloads; point "
+                               "NOBEL_TILE_UPSTREAM at your own tile server (or 'stub') to prewarm. "
+                               "The proxy still caches OpenStreetMap tiles as they are requested.")
+    # A single process fills the cache, so it gets the whole limit
+    proxy = create_proxy(config['TILE_UPSTREAM'], config['TILE_CACHE_DIR'], config['TILE_CACHE_MB'] * 1024 * 1024)
+
+    total = sum(4 ** z for z in range(max_zoom + 1))
+    failed = 0
+    start = time.perf_counter()
+    for z in range(max_zoom + 1):
+        for x in range(2 ** z):
+            for y in range(2 ** z):
+                fetches = proxy.upstream_fetches
+                if proxy.get(z, x, y) is None:
+                    failed += 1
+                if proxy.upstream_fetches > fetches and delay:
+                    time.sleep(delay)
+        print(f"  zoom {z}: {4 ** z} tiles")
+    print(f"✓ {total - failed}/{total} tiles cached in {time.perf_counter() - start:.1f}s "
+          f"({proxy.cache.total_bytes / 1024 / 1024:.1f} MB in {config['TILE_CACHE_DIR']})")
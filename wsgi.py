@@ -0,0 +1,10 @@
+"""
+WSGI entry point for production servers
+The app (and the data) is created at import time, so with gunicorn's
+preload_app it is loaded once in the master and shared with every worker.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import create_app
+
+app = create_app()